@@ -7,17 +7,20 @@ This package provides tools for QA engineers to:
 - Generate structured test case documentation (JSON, Markdown, HTML)
 """
 
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 __author__ = "TestCaseer Team"
 
-from testcaseer.models import (
-    ConsoleLog,
-    ElementInfo,
-    NetworkRequest,
-    PageError,
-    Step,
-    TestCase,
-)
+if TYPE_CHECKING:
+    from testcaseer.models import (
+        ConsoleLog,
+        ElementInfo,
+        NetworkRequest,
+        PageError,
+        Step,
+        TestCase,
+    )
 
 __all__ = [
     "__version__",
@@ -28,3 +31,16 @@ __all__ = [
     "Step",
     "TestCase",
 ]
+
+# Models are re-exported lazily (PEP 562) so that `import testcaseer` — and the
+# CLI entry point, which only needs __version__ — does not pay for pydantic.
+_LAZY_MODELS = frozenset(__all__) - {"__version__"}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve model re-exports on first access."""
+    if name in _LAZY_MODELS:
+        from testcaseer import models
+
+        return getattr(models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,277 @@
+(function() {
+    // Don't inject twice
+    if (window.__testcaseer_events_injected) return;
+    window.__testcaseer_events_injected = true;
+    
+    // Helper: Check if element is part of control panel
+    function isControlPanel(el) {
+        return el.closest('#__testcaseer_panel__') !== null;
+    }
+    
+    // Selector caches; any change to the DOM structure or to attributes the
+    // selectors are built from drops them, so cached paths never go stale
+    let selectorCache = new WeakMap();
+    let xpathCache = new WeakMap();
+    new MutationObserver((records) => {
+        // Step counter updates in the control panel don't affect the page
+        if (records.every(r => r.target.closest && isControlPanel(r.target))) return;
+        selectorCache = new WeakMap();
+        xpathCache = new WeakMap();
+    }).observe(document, {
+        childList: true,
+        subtree: true,
+        attributes: true,
+        attributeFilter: ['id', 'class', 'data-testid']
+    });
+    
+    // Helper: Selector that identifies el on its own, or null when it has
+    // to be built from the parent's selector
+    function anchorSelector(el) {
+        if (!el || el === document.body || el === document.documentElement) {
+            return 'body';
+        }
+        
+        // Try ID first
+        if (el.id) {
+            return '#' + CSS.escape(el.id);
+        }
+        
+        // Try data-testid
+        if (el.dataset && el.dataset.testid) {
+            return '[data-testid="' + el.dataset.testid + '"]';
+        }
+        
+        // Try unique class combination
+        if (el.className && typeof el.className === 'string') {
+            const classes = el.className.trim().split(/\s+/).filter(c => c.length > 0);
+            if (classes.length > 0) {
+                const selector = el.tagName.toLowerCase() + '.' + classes.map(c => CSS.escape(c)).join('.');
+                // querySelector stops at the first match: if that isn't el,
+                // the selector can't be unique and the full scan is skipped
+                if (document.querySelector(selector) === el
+                        && document.querySelectorAll(selector).length === 1) {
+                    return selector;
+                }
+            }
+        }
+        
+        if (!el.parentElement) {
+            return el.tagName.toLowerCase();
+        }
+        return null;
+    }
+    
+    // Helper: Path segment for el below its parent
+    function childSegment(el) {
+        const tag = el.tagName.toLowerCase();
+        const siblings = Array.from(el.parentElement.children).filter(
+            child => child.tagName === el.tagName
+        );
+        if (siblings.length === 1) return tag;
+        return tag + ':nth-of-type(' + (siblings.indexOf(el) + 1) + ')';
+    }
+    
+    // Helper: Generate CSS selector for element. Walks up to the nearest
+    // ancestor with a cached or self-sufficient selector, then caches the
+    // selector of every element on the way back down
+    function getCssSelector(el) {
+        const chain = [];
+        const segments = [];
+        let selector;
+        while (true) {
+            const cached = el ? selectorCache.get(el) : undefined;
+            if (cached !== undefined) {
+                selector = cached;
+                break;
+            }
+            const anchor = anchorSelector(el);
+            if (anchor !== null) {
+                selector = anchor;
+                if (el) selectorCache.set(el, selector);
+                break;
+            }
+            chain.push(el);
+            segments.push(childSegment(el));
+            el = el.parentElement;
+        }
+        
+        for (let i = chain.length - 1; i >= 0; i--) {
+            selector += ' > ' + segments[i];
+            selectorCache.set(chain[i], selector);
+        }
+        return selector;
+    }
+    
+    // Helper: Get XPath for element, walking up the same way as getCssSelector
+    function getXPath(el) {
+        const chain = [];
+        const segments = [];
+        let xpath = '';
+        while (el && el.nodeType === Node.ELEMENT_NODE) {
+            const cached = xpathCache.get(el);
+            if (cached !== undefined) {
+                xpath = cached;
+                break;
+            }
+            if (el.id || el === document.body) {
+                xpath = el.id ? '//*[@id="' + el.id + '"]' : '/html/body';
+                xpathCache.set(el, xpath);
+                break;
+            }
+            
+            const parent = el.parentNode;
+            const sameTagSiblings = parent
+                ? Array.from(parent.children).filter(s => s.tagName === el.tagName)
+                : [];
+            let segment = '/' + el.tagName.toLowerCase();
+            if (sameTagSiblings.length > 1) {
+                segment += '[' + (sameTagSiblings.indexOf(el) + 1) + ']';
+            }
+            chain.push(el);
+            segments.push(segment);
+            el = parent;
+        }
+        
+        for (let i = chain.length - 1; i >= 0; i--) {
+            xpath += segments[i];
+            xpathCache.set(chain[i], xpath);
+        }
+        return xpath;
+    }
+    
+    // Helper: Get element info
+    function getElementInfo(el) {
+        const rect = el.getBoundingClientRect();
+        return {
+            selector: getCssSelector(el),
+            xpath: getXPath(el),
+            tagName: el.tagName.toLowerCase(),
+            text: (el.innerText || el.textContent || '').substring(0, 100).trim(),
+            placeholder: el.placeholder || null,
+            id: el.id || null,
+            name: el.name || null,
+            type: el.type || null,
+            href: el.href || null,
+            value: el.value || null,
+            className: el.className || null,
+            attributes: {},
+            boundingBox: {
+                x: Math.round(rect.x),
+                y: Math.round(rect.y),
+                width: Math.round(rect.width),
+                height: Math.round(rect.height)
+            }
+        };
+    }
+    
+    // Per-field debounce timers; Python coalesces the rest per selector
+    const inputDebounceTimers = {};
+    
+    // Click handler
+    document.addEventListener('click', async (e) => {
+        if (isControlPanel(e.target)) return;
+        
+        const info = getElementInfo(e.target);
+        info.eventType = 'click';
+        info.clientX = e.clientX;
+        info.clientY = e.clientY;
+        
+        try {
+            await window.__testcaseer_on_action(info);
+        } catch (err) {
+            console.debug('TestCaseer: click handler error', err);
+        }
+    }, true);
+    
+    // Double-click handler
+    document.addEventListener('dblclick', async (e) => {
+        if (isControlPanel(e.target)) return;
+        
+        const info = getElementInfo(e.target);
+        info.eventType = 'dblclick';
+        
+        try {
+            await window.__testcaseer_on_action(info);
+        } catch (err) {
+            console.debug('TestCaseer: dblclick handler error', err);
+        }
+    }, true);
+    
+    // Input handler (debounced)
+    document.addEventListener('input', (e) => {
+        if (isControlPanel(e.target)) return;
+        
+        const el = e.target;
+        const selector = getCssSelector(el);
+        
+        // Clear previous timer for this field only, so switching fields
+        // quickly doesn't drop what was typed in the previous one
+        clearTimeout(inputDebounceTimers[selector]);
+        
+        // Short debounce to batch keystrokes; the recorder waits for the
+        // field to go idle before creating a step
+        inputDebounceTimers[selector] = setTimeout(async () => {
+            delete inputDebounceTimers[selector];
+            const info = getElementInfo(el);
+            info.eventType = 'input';
+            info.value = el.value;
+            
+            try {
+                await window.__testcaseer_on_action(info);
+            } catch (err) {
+                console.debug('TestCaseer: input handler error', err);
+            }
+        }, 50);
+    }, true);
+    
+    // Change handler (for select, checkbox, radio)
+    document.addEventListener('change', async (e) => {
+        if (isControlPanel(e.target)) return;
+        
+        const el = e.target;
+        const info = getElementInfo(el);
+        
+        // Determine action type based on element
+        if (el.type === 'checkbox') {
+            info.eventType = el.checked ? 'check' : 'uncheck';
+            info.checked = el.checked;
+        } else if (el.type === 'radio') {
+            info.eventType = 'check';
+            info.checked = el.checked;
+        } else if (el.tagName.toLowerCase() === 'select') {
+            info.eventType = 'select';
+            info.value = el.value;
+            info.selectedText = el.options[el.selectedIndex]?.text || '';
+        } else {
+            // Skip for regular inputs (handled by input event)
+            return;
+        }
+        
+        try {
+            await window.__testcaseer_on_action(info);
+        } catch (err) {
+            console.debug('TestCaseer: change handler error', err);
+        }
+    }, true);
+    
+    // Keypress handler (for special keys like Enter)
+    document.addEventListener('keydown', async (e) => {
+        if (isControlPanel(e.target)) return;
+        
+        // Only capture special keys
+        const specialKeys = ['Enter', 'Escape', 'Tab'];
+        if (!specialKeys.includes(e.key)) return;
+        
+        const info = getElementInfo(e.target);
+        info.eventType = 'keypress';
+        info.key = e.key;
+        
+        try {
+            await window.__testcaseer_on_action(info);
+        } catch (err) {
+            console.debug('TestCaseer: keydown handler error', err);
+        }
+    }, true);
+    
+    console.log('TestCaseer: Event listeners injected');
+})();
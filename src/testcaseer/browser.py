@@ -1,17 +1,121 @@
 """Browser management for TestCaseer."""
 
-from typing import Literal
+from __future__ import annotations
 
-from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+import asyncio
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright
 
 BrowserType = Literal["chromium", "firefox", "webkit"]
+WaitUntil = Literal["commit", "domcontentloaded", "load", "networkidle"]
+
+
+class BrowserPool:
+    """
+    Shares launched browsers between recording sessions.
+
+    Launching a browser process is far more expensive than opening a new
+    context in an already running one, so sessions acquire a browser from
+    the pool and only own their context and page. Browsers are reference
+    counted per (browser_type, headless) pair.
+
+    By default a browser is closed as soon as its last session releases it.
+    With ``keep_alive=True`` it stays up for the next session until
+    ``close()`` is called.
+    """
+
+    def __init__(self, keep_alive: bool = False) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            keep_alive: Keep idle browsers running until close() is called
+        """
+        self.keep_alive = keep_alive
+
+        self._playwright: Playwright | None = None
+        self._browsers: dict[tuple[BrowserType, bool], Browser] = {}
+        self._refcounts: dict[tuple[BrowserType, bool], int] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, browser_type: BrowserType, headless: bool) -> Browser:
+        """
+        Get a running browser, launching it on first use.
+
+        Args:
+            browser_type: Browser to use (chromium, firefox, webkit)
+            headless: Run browser without GUI
+
+        Returns:
+            Shared Browser instance
+        """
+        key = (browser_type, headless)
+        async with self._lock:
+            browser = self._browsers.get(key)
+            if browser is None or not browser.is_connected():
+                if self._playwright is None:
+                    # Imported here so importing the package does not load Playwright
+                    from playwright.async_api import async_playwright
+
+                    self._playwright = await async_playwright().start()
+
+                # Get browser launcher based on type
+                launcher = getattr(self._playwright, browser_type)
+                browser = await launcher.launch(headless=headless)
+                self._browsers[key] = browser
+                # After a disconnect, sessions on the old browser still release
+                # their reference, so the count carries over to the relaunch
+                self._refcounts.setdefault(key, 0)
+
+            self._refcounts[key] += 1
+            return browser
+
+    async def release(self, browser_type: BrowserType, headless: bool) -> None:
+        """
+        Release a browser obtained from acquire().
+
+        Args:
+            browser_type: Browser type passed to acquire()
+            headless: Headless flag passed to acquire()
+        """
+        key = (browser_type, headless)
+        async with self._lock:
+            count = self._refcounts.get(key, 0) - 1
+            self._refcounts[key] = max(count, 0)
+            if count <= 0 and not self.keep_alive:
+                await self._close_browser(key)
+
+    async def close(self) -> None:
+        """Close all browsers and stop Playwright."""
+        async with self._lock:
+            for key in list(self._browsers):
+                await self._close_browser(key)
+
+            # A launch that failed or was cancelled leaves the driver with no browser
+            if self._playwright:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def _close_browser(self, key: tuple[BrowserType, bool]) -> None:
+        """Close one browser and stop Playwright once nothing is left running."""
+        self._refcounts.pop(key, None)
+        browser = self._browsers.pop(key, None)
+        if browser:
+            await browser.close()
+
+        if not self._browsers and self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
 
 
 class BrowserManager:
     """
-    Manages Playwright browser lifecycle.
+    Manages a single browser session.
 
-    Handles browser launch, page creation, and cleanup.
+    Acquires a browser from a BrowserPool and handles context/page creation
+    and cleanup.
     """
 
     def __init__(
@@ -20,6 +124,7 @@ class BrowserManager:
         headless: bool = False,
         viewport: tuple[int, int] = (1280, 720),
         timeout: int = 30000,
+        pool: BrowserPool | None = None,
     ) -> None:
         """
         Initialize browser manager.
@@ -29,13 +134,14 @@ class BrowserManager:
             headless: Run browser without GUI
             viewport: Browser window size (width, height)
             timeout: Default timeout for operations in ms
+            pool: Pool to take the browser from (a private one if not given)
         """
         self.browser_type = browser_type
         self.headless = headless
         self.viewport = {"width": viewport[0], "height": viewport[1]}
         self.timeout = timeout
 
-        self._playwright: Playwright | None = None
+        self._pool = pool if pool is not None else BrowserPool()
         self._browser: Browser | None = None
         self._context: BrowserContext | None = None
         self._page: Page | None = None
@@ -56,20 +162,13 @@ class BrowserManager:
 
     async def start(self) -> Page:
         """
-        Start browser and create a new page.
+        Start a browser session and create a new page.
 
         Returns:
             The created Page object
         """
-        self._playwright = await async_playwright().start()
-
-        # Get browser launcher based on type
-        launcher = getattr(self._playwright, self.browser_type)
-
-        # Launch browser
-        self._browser = await launcher.launch(
-            headless=self.headless,
-        )
+        # Launch browser (or reuse one already running in the pool)
+        self._browser = await self._pool.acquire(self.browser_type, self.headless)
 
         # Create context with viewport
         self._context = await self._browser.new_context(
@@ -84,17 +183,21 @@ class BrowserManager:
 
         return self._page
 
-    async def navigate(self, url: str) -> None:
+    async def navigate(self, url: str, wait_until: WaitUntil = "commit") -> None:
         """
         Navigate to a URL.
 
+        Returns as soon as the navigation commits by default; the injected
+        init scripts take care of waiting for the DOM themselves.
+
         Args:
             url: URL to navigate to
+            wait_until: Playwright load state to wait for
         """
-        await self.page.goto(url, wait_until="domcontentloaded")
+        await self.page.goto(url, wait_until=wait_until)
 
     async def close(self) -> None:
-        """Close browser and cleanup resources."""
+        """Close the session and release the browser back to the pool."""
         if self._page:
             await self._page.close()
             self._page = None
@@ -104,12 +207,8 @@ class BrowserManager:
             self._context = None
 
         if self._browser:
-            await self._browser.close()
             self._browser = None
-
-        if self._playwright:
-            await self._playwright.stop()
-            self._playwright = None
+            await self._pool.release(self.browser_type, self.headless)
 
     def get_user_agent(self) -> str:
         """Get the browser's user agent string."""
@@ -118,7 +217,7 @@ class BrowserManager:
         # This will be populated after page is created
         return str(self._page.context.browser.browser_type.name)
 
-    async def __aenter__(self) -> "BrowserManager":
+    async def __aenter__(self) -> BrowserManager:
         """Async context manager entry."""
         await self.start()
         return self
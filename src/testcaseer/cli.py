@@ -1,19 +1,25 @@
 """Command-line interface for TestCaseer."""
 
-import asyncio
+import functools
+import os
 import re
 import sys
-from enum import Enum
+from collections.abc import Callable
+from enum import Enum, StrEnum
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
+from urllib.parse import urlparse
 
 import typer
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
 from testcaseer import __version__
 
+if TYPE_CHECKING:
+    import asyncio
+
+    from rich.panel import Panel
+
 
 # Browser choices enum for validation
 class BrowserType(str, Enum):
@@ -22,6 +28,13 @@ class BrowserType(str, Enum):
     webkit = "webkit"
 
 
+# Export formats for --format
+class ExportFormat(StrEnum):
+    json = "json"
+    markdown = "markdown"
+    html = "html"
+
+
 app = typer.Typer(
     name="testcaseer",
     help="Record browser actions and generate test cases for QA engineers.",
@@ -30,6 +43,29 @@ app = typer.Typer(
 )
 console = Console()
 
+# Compiled once at import; validate_url runs on every `record` invocation
+_URL_RE = re.compile(
+    r"^https?://"  # http:// or https://
+    r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|"  # domain
+    r"localhost|"  # localhost
+    r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # or IP
+    r"(?::\d+)?"  # optional port
+    r"(?:/?|[/?]\S+)$",
+    re.IGNORECASE,
+)
+_MAX_URL_LENGTH = 2048
+# Control characters and whitespace are never valid in the URLs we accept
+_URL_FORBIDDEN_CHARS = frozenset(map(chr, range(0x21))) | {"\x7f"}
+
+
+def _url_prechecks_pass(url: str) -> bool:
+    """Reject obviously malformed URLs with plain string checks before the regex."""
+    if len(url) > _MAX_URL_LENGTH or not _URL_FORBIDDEN_CHARS.isdisjoint(url):
+        return False
+
+    host = url.partition("://")[2].partition("/")[0].partition("?")[0]
+    return "." in host or host.lower().startswith("localhost")
+
 
 def validate_url(url: str) -> str:
     """Validate and normalize URL."""
@@ -38,17 +74,7 @@ def validate_url(url: str) -> str:
         url = f"https://{url}"
 
     # Basic URL validation
-    url_pattern = re.compile(
-        r"^https?://"  # http:// or https://
-        r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|"  # domain
-        r"localhost|"  # localhost
-        r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # or IP
-        r"(?::\d+)?"  # optional port
-        r"(?:/?|[/?]\S+)$",
-        re.IGNORECASE,
-    )
-
-    if not url_pattern.match(url):
+    if not (_url_prechecks_pass(url) and _URL_RE.match(url)):
         console.print(f"[red]✗ Invalid URL:[/red] {url}")
         console.print("  URL should be like: https://example.com or example.com")
         raise typer.Exit(1)
@@ -56,27 +82,25 @@ def validate_url(url: str) -> str:
     return url
 
 
+def _find_non_directory(path: Path) -> Path:
+    """Find the first existing component of ``path`` that is not a directory."""
+    for candidate in (*reversed(path.parents), path):
+        if candidate.exists() and not candidate.is_dir():
+            return candidate
+    return path
+
+
 def validate_output_dir(output: Path) -> Path:
     """Validate output directory path."""
-    # Check if parent directory exists or can be created
+    created = not output.exists()
+    # One makedirs call creates the output and screenshots directories (or
+    # finds them already there); a non-directory in the way surfaces as an error
     try:
-        output = output.resolve()
-
-        # If path exists, check if it's a directory
-        if output.exists():
-            if not output.is_dir():
-                console.print(f"[red]✗ Output path is not a directory:[/red] {output}")
-                raise typer.Exit(1)
-        else:
-            # Try to create the directory
-            output.mkdir(parents=True, exist_ok=True)
-            console.print(f"[dim]Created output directory: {output}[/dim]")
-
-        # Create screenshots subdirectory
-        screenshots_dir = output / "screenshots"
-        screenshots_dir.mkdir(exist_ok=True)
-
-        return output
+        os.makedirs(output / "screenshots", exist_ok=True)
+    except (NotADirectoryError, FileExistsError):
+        blocking = _find_non_directory(output / "screenshots")
+        console.print(f"[red]✗ Not a directory:[/red] {blocking}")
+        raise typer.Exit(1) from None
     except PermissionError:
         console.print(f"[red]✗ Permission denied:[/red] Cannot create {output}")
         raise typer.Exit(1) from None
@@ -84,16 +108,28 @@ def validate_output_dir(output: Path) -> Path:
         console.print(f"[red]✗ Invalid path:[/red] {e}")
         raise typer.Exit(1) from None
 
+    output = output.resolve()
+    if created:
+        console.print(f"[dim]Created output directory: {output}[/dim]")
+    return output
 
-def print_banner() -> None:
-    """Print TestCaseer banner."""
-    banner = Panel(
+
+@functools.cache
+def _banner() -> "Panel":
+    """Build the banner once; it only depends on the package version."""
+    from rich.panel import Panel
+
+    return Panel(
         "[bold green]TestCaseer[/bold green] — Browser Action Recorder\n"
         f"[dim]Version {__version__}[/dim]",
         border_style="green",
         padding=(0, 2),
     )
-    console.print(banner)
+
+
+def print_banner() -> None:
+    """Print TestCaseer banner."""
+    console.print(_banner())
 
 
 def print_session_info(
@@ -103,8 +139,11 @@ def print_session_info(
     browser: str,
     headless: bool,
     timeout: int,
+    formats: list[str],
 ) -> None:
     """Print recording session information."""
+    from rich.table import Table
+
     table = Table(show_header=False, box=None, padding=(0, 2))
     table.add_column("Key", style="dim")
     table.add_column("Value")
@@ -115,15 +154,15 @@ def print_session_info(
     table.add_row("Browser", browser)
     table.add_row("Headless", "Yes" if headless else "No")
     table.add_row("Timeout", f"{timeout}ms")
+    table.add_row("Formats", ", ".join(formats))
 
     console.print("\n[bold]Session Configuration:[/bold]")
     console.print(table)
 
 
+@functools.lru_cache(maxsize=256)
 def generate_testcase_name(url: str) -> str:
     """Generate a default test case name from URL."""
-    from urllib.parse import urlparse
-
     parsed = urlparse(url)
     domain = parsed.netloc.replace("www.", "")
     path = parsed.path.strip("/").replace("/", "_")
@@ -133,6 +172,20 @@ def generate_testcase_name(url: str) -> str:
     return domain
 
 
+def get_loop_factory() -> "Callable[[], asyncio.AbstractEventLoop] | None":
+    """
+    Pick the event loop implementation for the recorder.
+
+    Uses uvloop when it is installed (Linux/macOS), otherwise returns None
+    so asyncio falls back to its default loop.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 @app.command()
 def record(
     url: Annotated[
@@ -183,6 +236,15 @@ def record(
             max=300000,
         ),
     ] = 30000,
+    formats: Annotated[
+        list[ExportFormat] | None,
+        typer.Option(
+            "--format",
+            "-f",
+            help="Output format to write; repeat for several (default: all)",
+            case_sensitive=False,
+        ),
+    ] = None,
 ) -> None:
     """
     Record browser actions and generate a test case.
@@ -194,6 +256,8 @@ def record(
 
     Output files (JSON, Markdown, HTML) are saved to the specified directory.
     """
+    selected_formats = [f.value for f in formats or ExportFormat]
+
     # Print banner
     print_banner()
 
@@ -208,7 +272,7 @@ def record(
         name = generate_testcase_name(url)
 
     # Print session info
-    print_session_info(url, output, name, browser.value, headless, timeout)
+    print_session_info(url, output, name, browser.value, headless, timeout, selected_formats)
 
     # Check if playwright is installed
     try:
@@ -223,6 +287,8 @@ def record(
     console.print("[dim]Press Ctrl+C to cancel.[/dim]\n")
 
     # Run the recorder
+    import asyncio
+
     try:
         asyncio.run(
             run_recorder(
@@ -232,7 +298,9 @@ def record(
                 browser_type=browser.value,
                 headless=headless,
                 timeout=timeout,
-            )
+                formats=selected_formats,
+            ),
+            loop_factory=get_loop_factory(),
         )
     except KeyboardInterrupt:
         console.print("\n[yellow]Recording cancelled by user.[/yellow]")
@@ -246,6 +314,7 @@ async def run_recorder(
     browser_type: str,
     headless: bool,
     timeout: int,
+    formats: list[str],
 ) -> None:
     """
     Run the browser recorder.
@@ -257,6 +326,7 @@ async def run_recorder(
         browser_type: Browser to use
         headless: Run browser without GUI
         timeout: Action timeout in ms
+        formats: Export formats to write
     """
     from testcaseer.recorder import Recorder
 
@@ -268,6 +338,7 @@ async def run_recorder(
         headless=headless,
         viewport=(1280, 720),
         timeout=timeout,
+        formats=formats,
     )
 
     await recorder.run()
@@ -276,93 +347,139 @@ async def run_recorder(
 @app.command()
 def version() -> None:
     """Show version and system information."""
-    print_banner()
+    from rich.table import Table
 
-    table = Table(show_header=False, box=None, padding=(0, 2))
-    table.add_column("Component", style="dim")
-    table.add_column("Version")
+    # Render everything into one write instead of a flush per line
+    with console:
+        print_banner()
 
-    table.add_row("TestCaseer", __version__)
-    py_ver = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
-    table.add_row("Python", py_ver)
+        table = Table(show_header=False, box=None, padding=(0, 2))
+        table.add_column("Component", style="dim")
+        table.add_column("Version")
 
-    # Check playwright
-    try:
-        from playwright._repo_version import version as pw_version
+        table.add_row("TestCaseer", __version__)
+        py_ver = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
+        table.add_row("Python", py_ver)
 
-        table.add_row("Playwright", pw_version)
-    except ImportError:
-        table.add_row("Playwright", "[red]Not installed[/red]")
+        # Check playwright
+        try:
+            from playwright._repo_version import version as pw_version
 
-    # Check pydantic
-    try:
-        import pydantic
+            table.add_row("Playwright", pw_version)
+        except ImportError:
+            table.add_row("Playwright", "[red]Not installed[/red]")
 
-        table.add_row("Pydantic", pydantic.__version__)
-    except ImportError:
-        table.add_row("Pydantic", "[red]Not installed[/red]")
+        # Check pydantic
+        try:
+            import pydantic
 
-    console.print("\n[bold]System Information:[/bold]")
-    console.print(table)
+            table.add_row("Pydantic", pydantic.__version__)
+        except ImportError:
+            table.add_row("Pydantic", "[red]Not installed[/red]")
+
+        console.print("\n[bold]System Information:[/bold]")
+        console.print(table)
+
+
+async def probe_browsers(browser_names: list[str]) -> list[bool]:
+    """
+    Check which Playwright browsers can be launched.
+
+    All probes share one Playwright driver and run concurrently, so the check
+    takes as long as the slowest browser, not the sum.
+
+    Args:
+        browser_names: Browsers to probe (chromium, firefox, webkit)
+
+    Returns:
+        For each browser, True if it launched, False if it is not installed
+
+    Raises:
+        Exception: If the Playwright driver itself cannot be started
+    """
+    import asyncio
+
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        launchers = {"chromium": p.chromium, "firefox": p.firefox, "webkit": p.webkit}
+
+        async def probe(browser_name: str) -> bool:
+            try:
+                browser = await launchers[browser_name].launch(headless=True)
+                await browser.close()
+            except Exception:
+                return False
+            return True
+
+        return list(await asyncio.gather(*(probe(name) for name in browser_names)))
 
 
 @app.command()
 def check() -> None:
     """Check if all dependencies are properly installed."""
-    print_banner()
-    console.print("\n[bold]Checking dependencies...[/bold]\n")
-
     all_ok = True
 
-    # Check Python version
-    py_version = f"{sys.version_info.major}.{sys.version_info.minor}"
-    console.print(f"[green]✓[/green] Python {py_version}")
-
-    # Check required packages
-    packages = [
-        ("playwright", "playwright"),
-        ("pydantic", "pydantic"),
-        ("typer", "typer"),
-        ("rich", "rich"),
-        ("jinja2", "jinja2"),
-        ("PIL", "pillow"),
-    ]
-
-    for import_name, package_name in packages:
+    # Buffer each block of output so it goes out in one write; the buffer is
+    # flushed before the browser probes so progress is visible while they run
+    with console:
+        print_banner()
+        console.print("\n[bold]Checking dependencies...[/bold]\n")
+
+        # Check Python version
+        py_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+        console.print(f"[green]✓[/green] Python {py_version}")
+
+        # Check required packages
+        packages = [
+            ("playwright", "playwright"),
+            ("pydantic", "pydantic"),
+            ("typer", "typer"),
+            ("rich", "rich"),
+            ("jinja2", "jinja2"),
+            ("PIL", "pillow"),
+        ]
+
+        for import_name, package_name in packages:
+            try:
+                __import__(import_name)
+                console.print(f"[green]✓[/green] {package_name}")
+            except ImportError:
+                console.print(
+                    f"[red]✗[/red] {package_name} — [dim]pip install {package_name}[/dim]"
+                )
+                all_ok = False
+
+        # Check playwright browsers
+        console.print("\n[bold]Checking browsers...[/bold]\n")
+
+    import asyncio
+
+    browser_names = [b.value for b in BrowserType]
+
+    with console:
         try:
-            __import__(import_name)
-            console.print(f"[green]✓[/green] {package_name}")
-        except ImportError:
-            console.print(f"[red]✗[/red] {package_name} — [dim]pip install {package_name}[/dim]")
-            all_ok = False
+            results = asyncio.run(probe_browsers(browser_names), loop_factory=get_loop_factory())
 
-    # Check playwright browsers
-    console.print("\n[bold]Checking browsers...[/bold]\n")
-
-    try:
-        from playwright.sync_api import sync_playwright
-
-        with sync_playwright() as p:
-            for browser_name in ["chromium", "firefox", "webkit"]:
-                try:
-                    browser_launcher = getattr(p, browser_name)
-                    browser = browser_launcher.launch(headless=True)
-                    browser.close()
+            for browser_name, available in zip(browser_names, results, strict=True):
+                if available:
                     console.print(f"[green]✓[/green] {browser_name}")
-                except Exception:
+                else:
                     install_cmd = f"playwright install {browser_name}"
                     console.print(f"[yellow]○[/yellow] {browser_name} — [dim]{install_cmd}[/dim]")
-    except Exception as e:
-        console.print(f"[red]✗[/red] Could not check browsers: {e}")
-        console.print("[dim]Run: playwright install[/dim]")
-        all_ok = False
-
-    # Summary
-    console.print()
-    if all_ok:
-        console.print("[bold green]✓ All checks passed![/bold green]")
-    else:
-        console.print("[bold yellow]⚠ Some checks failed. See above for details.[/bold yellow]")
+        except Exception as e:
+            console.print(f"[red]✗[/red] Could not check browsers: {e}")
+            console.print("[dim]Run: playwright install[/dim]")
+            all_ok = False
+
+        # Summary
+        console.print()
+        if all_ok:
+            console.print("[bold green]✓ All checks passed![/bold green]")
+        else:
+            console.print("[bold yellow]⚠ Some checks failed. See above for details.[/bold yellow]")
+
+    if not all_ok:
         raise typer.Exit(1)
 
 
@@ -2,262 +2,200 @@
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
+import functools
+import json
+from importlib.resources import files
 from typing import TYPE_CHECKING
 
+try:
+    import orjson
+
+    def _to_json(obj: object) -> str:
+        """Serialize panel state with orjson when it is installed."""
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+
+    def _to_json(obj: object) -> str:
+        """Serialize panel state with the stdlib fallback."""
+        return json.dumps(obj, separators=(",", ":"))
+
+
 if TYPE_CHECKING:
-    from playwright.async_api import Page
-
-    from testcaseer.recorder import Recorder
-
-
-# JavaScript for the control panel UI
-CONTROL_PANEL_JS = """
-(function() {
-    // Don't inject if already present
-    if (document.getElementById('__testcaseer_panel__')) return;
-    
-    // Create panel container
-    const panel = document.createElement('div');
-    panel.id = '__testcaseer_panel__';
-    
-    // Inject styles
-    const styles = document.createElement('style');
-    styles.textContent = `
-        #__testcaseer_panel__ {
-            position: fixed;
-            top: 10px;
-            right: 10px;
-            z-index: 2147483647;
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            border: 2px solid #4ade80;
-            border-radius: 12px;
-            padding: 12px 16px;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            font-size: 14px;
-            color: #fff;
-            box-shadow: 0 8px 32px rgba(0,0,0,0.4), 0 0 0 1px rgba(255,255,255,0.1);
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            user-select: none;
-            cursor: move;
-            backdrop-filter: blur(8px);
-        }
-        
-        #__testcaseer_panel__.recording {
-            border-color: #ef4444;
-            box-shadow: 0 8px 32px rgba(239, 68, 68, 0.3), 0 0 0 1px rgba(255,255,255,0.1);
-        }
-        
-        #__testcaseer_panel__ .logo {
-            font-weight: 700;
-            font-size: 15px;
-            color: #4ade80;
-            letter-spacing: -0.5px;
-        }
-        
-        #__testcaseer_panel__ .divider {
-            width: 1px;
-            height: 24px;
-            background: rgba(255,255,255,0.2);
-        }
-        
-        #__testcaseer_panel__ .status {
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-        
-        #__testcaseer_panel__ .status-dot {
-            width: 10px;
-            height: 10px;
-            border-radius: 50%;
-            background: #666;
-            transition: background 0.3s;
-        }
-        
-        #__testcaseer_panel__ .status-dot.recording {
-            background: #ef4444;
-            animation: __tc_pulse 1.5s ease-in-out infinite;
-        }
-        
-        @keyframes __tc_pulse {
-            0%, 100% { opacity: 1; box-shadow: 0 0 0 0 rgba(239, 68, 68, 0.7); }
-            50% { opacity: 0.8; box-shadow: 0 0 0 8px rgba(239, 68, 68, 0); }
-        }
-        
-        #__testcaseer_panel__ .status-text {
-            font-size: 13px;
-            color: #a0a0a0;
-        }
-        
-        #__testcaseer_panel__ .steps-count {
-            font-size: 12px;
-            color: #888;
-            min-width: 60px;
-        }
-        
-        #__testcaseer_panel__ button {
-            background: #4ade80;
-            color: #000;
-            border: none;
-            border-radius: 8px;
-            padding: 8px 16px;
-            font-weight: 600;
-            font-size: 13px;
-            cursor: pointer;
-            transition: all 0.2s;
-            display: flex;
-            align-items: center;
-            gap: 6px;
-        }
-        
-        #__testcaseer_panel__ button:hover {
-            background: #22c55e;
-            transform: translateY(-1px);
-        }
-        
-        #__testcaseer_panel__ button:active {
-            transform: translateY(0);
-        }
-        
-        #__testcaseer_panel__ button.stop {
-            background: #ef4444;
-            color: #fff;
-        }
-        
-        #__testcaseer_panel__ button.stop:hover {
-            background: #dc2626;
-        }
-        
-        #__testcaseer_panel__ .message {
-            font-size: 13px;
-            color: #4ade80;
-            font-weight: 500;
-        }
-    `;
-    document.head.appendChild(styles);
-    
-    // Panel HTML
-    panel.innerHTML = `
-        <span class="logo">TestCaseer</span>
-        <span class="divider"></span>
-        <div class="status">
-            <span class="status-dot" id="__tc_status_dot__"></span>
-            <span class="status-text" id="__tc_status_text__">Ready</span>
-        </div>
-        <span class="steps-count" id="__tc_steps_count__"></span>
-        <button id="__tc_start_btn__">▶ Start</button>
-        <button id="__tc_stop_btn__" class="stop" style="display:none">⏹ Stop</button>
-        <span class="message" id="__tc_message__" style="display:none"></span>
-    `;
-    
-    document.body.appendChild(panel);
-    
-    // Make panel draggable
-    let isDragging = false;
-    let dragOffsetX = 0;
-    let dragOffsetY = 0;
-    
-    panel.addEventListener('mousedown', (e) => {
-        if (e.target.tagName === 'BUTTON') return;
-        isDragging = true;
-        dragOffsetX = e.clientX - panel.offsetLeft;
-        dragOffsetY = e.clientY - panel.offsetTop;
-        panel.style.cursor = 'grabbing';
-    });
-    
-    document.addEventListener('mousemove', (e) => {
-        if (!isDragging) return;
-        panel.style.left = (e.clientX - dragOffsetX) + 'px';
-        panel.style.top = (e.clientY - dragOffsetY) + 'px';
-        panel.style.right = 'auto';
-    });
-    
-    document.addEventListener('mouseup', () => {
-        isDragging = false;
-        panel.style.cursor = 'move';
-    });
-    
-    // Button handlers
-    document.getElementById('__tc_start_btn__').onclick = async () => {
-        try {
-            await window.__testcaseer_start_recording();
-        } catch (e) {
-            console.error('TestCaseer: Failed to start recording', e);
-        }
-    };
-    
-    document.getElementById('__tc_stop_btn__').onclick = async () => {
-        try {
-            await window.__testcaseer_stop_recording();
-        } catch (e) {
-            console.error('TestCaseer: Failed to stop recording', e);
-        }
-    };
-})();
-"""
-
-
-def get_update_ui_script(is_recording: bool, steps_count: int, message: str = "") -> str:
+    from typing import Protocol
+
+    from playwright.async_api import CDPSession, Page
+
+    class _RecorderLike(Protocol):
+        """Anything the panel buttons can drive; Recorder satisfies this."""
+
+        async def start_recording(self) -> None: ...
+
+        async def stop_recording(self) -> None: ...
+
+
+def minify_js(source: str) -> str:
     """
-    Generate JavaScript to update the control panel UI.
+    Cheaply shrink an injected script before it is sent over CDP.
+
+    Strips indentation, blank lines and full-line ``//`` comments. Line breaks
+    are kept so automatic semicolon insertion behaves exactly as in the source.
 
     Args:
-        is_recording: Whether recording is active
-        steps_count: Number of recorded steps
-        message: Optional message to display
+        source: JavaScript source code
 
     Returns:
-        JavaScript code to execute
+        Minified JavaScript source
     """
-    status_class = "recording" if is_recording else ""
-    status_text = "Recording..." if is_recording else "Ready"
-    start_display = "none" if is_recording else "inline-flex"
-    stop_display = "inline-flex" if is_recording else "none"
-    steps_text = f"{steps_count} steps" if steps_count > 0 else ""
-    panel_class = "recording" if is_recording else ""
-    message_display = "inline" if message else "none"
-
-    return f"""
-    (function() {{
-        const panel = document.getElementById('__testcaseer_panel__');
-        if (!panel) return;
-        
-        panel.className = '{panel_class}';
-        
-        const dot = document.getElementById('__tc_status_dot__');
-        if (dot) dot.className = 'status-dot {status_class}';
-        
-        const text = document.getElementById('__tc_status_text__');
-        if (text) text.textContent = '{status_text}';
-        
-        const startBtn = document.getElementById('__tc_start_btn__');
-        if (startBtn) startBtn.style.display = '{start_display}';
-        
-        const stopBtn = document.getElementById('__tc_stop_btn__');
-        if (stopBtn) stopBtn.style.display = '{stop_display}';
-        
-        const steps = document.getElementById('__tc_steps_count__');
-        if (steps) steps.textContent = '{steps_text}';
-        
-        const msg = document.getElementById('__tc_message__');
-        if (msg) {{
-            msg.textContent = '{message}';
-            msg.style.display = '{message_display}';
-        }}
-    }})();
+    lines = (line.strip() for line in source.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+@functools.cache
+def get_control_panel_js() -> str:
+    """
+    Load the control panel script shipped in ``testcaseer/assets``.
+
+    The file is read and minified once per process; this is what actually
+    gets sent to the browser.
+
+    Returns:
+        Minified control panel JavaScript
     """
+    source = files("testcaseer").joinpath("assets", "control_panel.js").read_text("utf-8")
+    return minify_js(source)
+
+
+# Panel state is passed as an evaluate() argument, so messages never need escaping
+UPDATE_UI_JS = "state => window.__tc_update && window.__tc_update(state)"
 
 
-async def inject_control_panel(page: Page, recorder: Recorder) -> None:
+class PanelUpdater:
+    """
+    Coalesces control panel updates into at most one evaluate per window.
+
+    Rapid bursts of recorded steps each want to refresh the step counter, but
+    only the latest state matters. ``schedule`` is non-blocking and just
+    replaces the pending state; a background task sends it after ``delay``.
+    ``send`` pushes a state immediately and drops anything still pending.
+
+    On Chromium updates go through a raw CDP session as a ``Runtime.evaluate``
+    that skips Playwright's evaluate wrapper and does not wait on the
+    script's own promise. It still takes one round trip to the browser, which
+    the background task absorbs. Other browsers fall back to ``page.evaluate``.
+    """
+
+    def __init__(self, page: Page, delay: float = 0.05) -> None:
+        """
+        Initialize the updater.
+
+        Args:
+            page: Playwright Page object
+            delay: Coalescing window in seconds
+        """
+        self.page = page
+        self.delay = delay
+        self._state: tuple[bool, int, str] | None = None
+        self._pending = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._session: CDPSession | None = None
+        self._session_checked = False
+
+    def start(self) -> None:
+        """Start the background task that flushes scheduled updates."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def schedule(self, is_recording: bool, steps_count: int, message: str = "") -> None:
+        """
+        Schedule a UI update without waiting for the browser.
+
+        Args:
+            is_recording: Whether recording is active
+            steps_count: Number of recorded steps
+            message: Optional message to display
+        """
+        self._state = (is_recording, steps_count, message)
+        self._pending.set()
+
+    async def send(self, is_recording: bool, steps_count: int, message: str = "") -> None:
+        """
+        Update the UI right away, superseding any scheduled update.
+
+        Args:
+            is_recording: Whether recording is active
+            steps_count: Number of recorded steps
+            message: Optional message to display
+        """
+        self._state = None
+        self._pending.clear()
+        await self._push((is_recording, steps_count, message))
+
+    async def close(self) -> None:
+        """Stop the background task and detach the CDP session."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._session is not None:
+            with contextlib.suppress(Exception):
+                await self._session.detach()
+            self._session = None
+
+    async def _get_session(self) -> CDPSession | None:
+        """Open the CDP session on first use; None if the browser has no CDP."""
+        if not self._session_checked:
+            self._session_checked = True
+            with contextlib.suppress(Exception):
+                self._session = await self.page.context.new_cdp_session(self.page)
+        return self._session
+
+    async def _push(self, state: tuple[bool, int, str]) -> None:
+        """Send one state to the page."""
+        session = await self._get_session()
+        if session is None:
+            await update_panel_ui(self.page, *state)
+            return
+
+        is_recording, steps_count, message = state
+        payload = _to_json(
+            {"isRecording": is_recording, "stepsCount": steps_count, "message": message}
+        )
+        # Page might have navigated, panel will be re-injected
+        with contextlib.suppress(Exception):
+            await session.send(
+                "Runtime.evaluate",
+                {
+                    "expression": f"({UPDATE_UI_JS})({payload})",
+                    "awaitPromise": False,
+                    "returnByValue": False,
+                },
+            )
+
+    async def _run(self) -> None:
+        """Wait for scheduled updates and send the latest one per window."""
+        while True:
+            await self._pending.wait()
+            await asyncio.sleep(self.delay)
+            self._pending.clear()
+            state, self._state = self._state, None
+            if state is not None:
+                await self._push(state)
+
+
+async def inject_control_panel(page: Page, recorder: _RecorderLike) -> PanelUpdater:
     """
     Inject the control panel into the page.
 
     Args:
         page: Playwright Page object
-        recorder: Recorder instance to bind controls to
+        recorder: Object whose start/stop_recording the buttons call
+
+    Returns:
+        Started PanelUpdater bound to the page
     """
     # Expose Python functions to JavaScript
     await page.expose_function(
@@ -269,11 +207,13 @@ async def inject_control_panel(page: Page, recorder: Recorder) -> None:
         recorder.stop_recording,
     )
 
-    # Add script that runs on every page load
-    await page.add_init_script(CONTROL_PANEL_JS)
+    # The init script is the single injection point: it runs on every hard
+    # navigation, and SPA route changes keep the existing panel
+    await page.add_init_script(get_control_panel_js())
 
-    # Also run it now for the current page
-    await page.evaluate(CONTROL_PANEL_JS)
+    updater = PanelUpdater(page)
+    updater.start()
+    return updater
 
 
 async def update_panel_ui(
@@ -288,7 +228,7 @@ async def update_panel_ui(
         steps_count: Number of recorded steps
         message: Optional message to display
     """
-    script = get_update_ui_script(is_recording, steps_count, message)
+    state = {"isRecording": is_recording, "stepsCount": steps_count, "message": message}
     # Page might have navigated, panel will be re-injected
     with contextlib.suppress(Exception):
-        await page.evaluate(script)
+        await page.evaluate(UPDATE_UI_JS, state)
@@ -2,234 +2,32 @@
 
 from __future__ import annotations
 
-import contextlib
+import functools
+from importlib.resources import files
 from typing import TYPE_CHECKING, Any
 
+from testcaseer.control_panel import minify_js
+
 if TYPE_CHECKING:
     from playwright.async_api import Page
 
     from testcaseer.recorder import Recorder
 
 
-# JavaScript for capturing DOM events
-EVENT_LISTENER_JS = """
-(function() {
-    // Don't inject twice
-    if (window.__testcaseer_events_injected) return;
-    window.__testcaseer_events_injected = true;
-    
-    // Helper: Check if element is part of control panel
-    function isControlPanel(el) {
-        return el.closest('#__testcaseer_panel__') !== null;
-    }
-    
-    // Helper: Generate CSS selector for element
-    function getCssSelector(el) {
-        if (!el || el === document.body || el === document.documentElement) {
-            return 'body';
-        }
-        
-        // Try ID first
-        if (el.id) {
-            return '#' + CSS.escape(el.id);
-        }
-        
-        // Try data-testid
-        if (el.dataset && el.dataset.testid) {
-            return '[data-testid="' + el.dataset.testid + '"]';
-        }
-        
-        // Try unique class combination
-        if (el.className && typeof el.className === 'string') {
-            const classes = el.className.trim().split(/\\s+/).filter(c => c.length > 0);
-            if (classes.length > 0) {
-                const selector = el.tagName.toLowerCase() + '.' + classes.join('.');
-                if (document.querySelectorAll(selector).length === 1) {
-                    return selector;
-                }
-            }
-        }
-        
-        // Build path from parent
-        const parent = el.parentElement;
-        if (!parent) {
-            return el.tagName.toLowerCase();
-        }
-        
-        const siblings = Array.from(parent.children).filter(
-            child => child.tagName === el.tagName
-        );
-        
-        if (siblings.length === 1) {
-            return getCssSelector(parent) + ' > ' + el.tagName.toLowerCase();
-        }
-        
-        const index = siblings.indexOf(el) + 1;
-        return getCssSelector(parent) + ' > ' + el.tagName.toLowerCase() + ':nth-of-type(' + index + ')';
-    }
-    
-    // Helper: Get XPath for element
-    function getXPath(el) {
-        if (!el) return '';
-        if (el.id) return '//*[@id="' + el.id + '"]';
-        if (el === document.body) return '/html/body';
-        
-        const siblings = el.parentNode ? Array.from(el.parentNode.children) : [];
-        const sameTagSiblings = siblings.filter(s => s.tagName === el.tagName);
-        
-        let path = '/' + el.tagName.toLowerCase();
-        if (sameTagSiblings.length > 1) {
-            path += '[' + (sameTagSiblings.indexOf(el) + 1) + ']';
-        }
-        
-        if (el.parentNode && el.parentNode !== document) {
-            return getXPath(el.parentNode) + path;
-        }
-        return path;
-    }
-    
-    // Helper: Get element info
-    function getElementInfo(el) {
-        const rect = el.getBoundingClientRect();
-        return {
-            selector: getCssSelector(el),
-            xpath: getXPath(el),
-            tagName: el.tagName.toLowerCase(),
-            text: (el.innerText || el.textContent || '').substring(0, 100).trim(),
-            placeholder: el.placeholder || null,
-            id: el.id || null,
-            name: el.name || null,
-            type: el.type || null,
-            href: el.href || null,
-            value: el.value || null,
-            className: el.className || null,
-            attributes: {},
-            boundingBox: {
-                x: rect.x,
-                y: rect.y,
-                width: rect.width,
-                height: rect.height
-            }
-        };
-    }
-    
-    // Track input values for debouncing
-    let inputDebounceTimer = null;
-    let lastInputValue = {};
-    
-    // Click handler
-    document.addEventListener('click', async (e) => {
-        if (isControlPanel(e.target)) return;
-        
-        const info = getElementInfo(e.target);
-        info.eventType = 'click';
-        info.clientX = e.clientX;
-        info.clientY = e.clientY;
-        
-        try {
-            await window.__testcaseer_on_action(info);
-        } catch (err) {
-            console.debug('TestCaseer: click handler error', err);
-        }
-    }, true);
-    
-    // Double-click handler
-    document.addEventListener('dblclick', async (e) => {
-        if (isControlPanel(e.target)) return;
-        
-        const info = getElementInfo(e.target);
-        info.eventType = 'dblclick';
-        
-        try {
-            await window.__testcaseer_on_action(info);
-        } catch (err) {
-            console.debug('TestCaseer: dblclick handler error', err);
-        }
-    }, true);
-    
-    // Input handler (debounced)
-    document.addEventListener('input', (e) => {
-        if (isControlPanel(e.target)) return;
-        
-        const el = e.target;
-        const selector = getCssSelector(el);
-        
-        // Clear previous timer
-        if (inputDebounceTimer) {
-            clearTimeout(inputDebounceTimer);
-        }
-        
-        // Store current value
-        lastInputValue[selector] = el.value;
-        
-        // Debounce: wait 500ms after last keystroke
-        inputDebounceTimer = setTimeout(async () => {
-            const info = getElementInfo(el);
-            info.eventType = 'input';
-            info.value = lastInputValue[selector];
-            
-            try {
-                await window.__testcaseer_on_action(info);
-            } catch (err) {
-                console.debug('TestCaseer: input handler error', err);
-            }
-            
-            delete lastInputValue[selector];
-        }, 500);
-    }, true);
-    
-    // Change handler (for select, checkbox, radio)
-    document.addEventListener('change', async (e) => {
-        if (isControlPanel(e.target)) return;
-        
-        const el = e.target;
-        const info = getElementInfo(el);
-        
-        // Determine action type based on element
-        if (el.type === 'checkbox') {
-            info.eventType = el.checked ? 'check' : 'uncheck';
-            info.checked = el.checked;
-        } else if (el.type === 'radio') {
-            info.eventType = 'check';
-            info.checked = el.checked;
-        } else if (el.tagName.toLowerCase() === 'select') {
-            info.eventType = 'select';
-            info.value = el.value;
-            info.selectedText = el.options[el.selectedIndex]?.text || '';
-        } else {
-            // Skip for regular inputs (handled by input event)
-            return;
-        }
-        
-        try {
-            await window.__testcaseer_on_action(info);
-        } catch (err) {
-            console.debug('TestCaseer: change handler error', err);
-        }
-    }, true);
-    
-    // Keypress handler (for special keys like Enter)
-    document.addEventListener('keydown', async (e) => {
-        if (isControlPanel(e.target)) return;
-        
-        // Only capture special keys
-        const specialKeys = ['Enter', 'Escape', 'Tab'];
-        if (!specialKeys.includes(e.key)) return;
-        
-        const info = getElementInfo(e.target);
-        info.eventType = 'keypress';
-        info.key = e.key;
-        
-        try {
-            await window.__testcaseer_on_action(info);
-        } catch (err) {
-            console.debug('TestCaseer: keydown handler error', err);
-        }
-    }, true);
-    
-    console.log('TestCaseer: Event listeners injected');
-})();
-"""
+@functools.cache
+def get_event_listener_js() -> str:
+    """
+    Load the DOM event listener script shipped in ``testcaseer/assets``.
+
+    The file is read and minified once per process. The stable sourceURL lets
+    V8 reuse its code cache for the script across navigations and names it
+    in DevTools.
+
+    Returns:
+        Minified event listener JavaScript
+    """
+    source = files("testcaseer").joinpath("assets", "event_listener.js").read_text("utf-8")
+    return minify_js(source) + "\n//# sourceURL=testcaseer-events.js"
 
 
 async def setup_event_listeners(page: Page, recorder: Recorder) -> None:
@@ -249,25 +47,14 @@ async def setup_event_listeners(page: Page, recorder: Recorder) -> None:
         recorder.on_action,
     )
 
-    # Add script that runs on every page load
-    await page.add_init_script(EVENT_LISTENER_JS)
-
-    # Also run it now for the current page
-    await page.evaluate(EVENT_LISTENER_JS)
-
-
-async def reinject_listeners(page: Page) -> None:
-    """
-    Re-inject event listeners after navigation.
+    # Runs before page scripts on every navigation; the script's own guard
+    # makes any repeat in the same document a no-op
+    script = get_event_listener_js()
+    await page.add_init_script(script)
 
-    Called when page navigates to ensure listeners are present.
-
-    Args:
-        page: Playwright Page object
-    """
-    # Page might still be loading
-    with contextlib.suppress(Exception):
-        await page.evaluate(EVENT_LISTENER_JS)
+    # Only a page that was already loaded needs an explicit run
+    if page.main_frame.url != "about:blank":
+        await page.evaluate(script)
 
 
 def parse_element_info(data: dict[str, Any]) -> dict[str, Any]:
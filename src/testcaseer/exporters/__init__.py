@@ -1,9 +1,12 @@
 """Exporters for test case output formats."""
 
-from testcaseer.exporters.base import BaseExporter
-from testcaseer.exporters.html_exporter import HTMLExporter
-from testcaseer.exporters.json_exporter import JSONExporter
-from testcaseer.exporters.markdown_exporter import MarkdownExporter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from testcaseer.exporters.base import BaseExporter
+    from testcaseer.exporters.html_exporter import HTMLExporter
+    from testcaseer.exporters.json_exporter import JSONExporter
+    from testcaseer.exporters.markdown_exporter import MarkdownExporter
 
 __all__ = [
     "BaseExporter",
@@ -11,3 +14,21 @@ __all__ = [
     "MarkdownExporter",
     "HTMLExporter",
 ]
+
+# Exporters are imported on first access (PEP 562), so using only the JSON
+# exporter never loads Jinja2
+_LAZY_EXPORTERS = {
+    "BaseExporter": "testcaseer.exporters.base",
+    "JSONExporter": "testcaseer.exporters.json_exporter",
+    "MarkdownExporter": "testcaseer.exporters.markdown_exporter",
+    "HTMLExporter": "testcaseer.exporters.html_exporter",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve exporter re-exports on first access."""
+    if name in _LAZY_EXPORTERS:
+        from importlib import import_module
+
+        return getattr(import_module(_LAZY_EXPORTERS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
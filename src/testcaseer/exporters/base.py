@@ -1,13 +1,133 @@
 """Base exporter class."""
 
+import functools
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
 
 from testcaseer.models import TestCase
 
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+
+@functools.cache
+def get_template_env() -> "Environment":
+    """
+    Get the Jinja2 environment shared by all template-based exporters.
+
+    Created once per process; templates ship with the package and never
+    change at runtime, so auto-reload checks are disabled.
+
+    Returns:
+        Shared Jinja2 Environment
+    """
+    from jinja2 import Environment, PackageLoader
+
+    return Environment(
+        loader=PackageLoader("testcaseer", "templates"),
+        auto_reload=False,
+        cache_size=-1,
+    )
+
+
+@functools.cache
+def get_template(name: str) -> "Template":
+    """
+    Get a compiled template from the shared environment.
+
+    Args:
+        name: Template file name in ``testcaseer/templates``
+
+    Returns:
+        Compiled Jinja2 Template
+    """
+    return get_template_env().get_template(name)
+
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """
+    Write a file unless it already holds exactly this content.
+
+    Re-exporting an unchanged test case then costs a stat and a read
+    instead of rewriting (possibly many megabytes of) output.
+
+    Args:
+        path: File to write
+        data: Full file content
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+
+    path.write_bytes(data)
+    return True
+
 
 class BaseExporter(ABC):
-    """Abstract base class for all exporters."""
+    """
+    Abstract base class for all exporters.
+
+    Template-based exporters set ``TEMPLATE_NAME`` and use ``template``,
+    which is compiled once per process and shared between instances.
+    """
+
+    TEMPLATE_NAME: ClassVar[str | None] = None
+
+    def __init__(self, dedupe: bool = True) -> None:
+        """
+        Initialize the exporter.
+
+        Args:
+            dedupe: Merge identical consecutive console logs and network
+                requests into one entry with a count
+        """
+        self.dedupe = dedupe
+
+    def prepare(self, testcase: TestCase) -> TestCase:
+        """
+        Get the test case as it should be written out.
+
+        Args:
+            testcase: TestCase object to export
+
+        Returns:
+            The test case, with repeats collapsed if ``dedupe`` is set
+        """
+        return testcase.collapse_repeats() if self.dedupe else testcase
+
+    @property
+    def template(self) -> "Template":
+        """Get the compiled template named by ``TEMPLATE_NAME``."""
+        if self.TEMPLATE_NAME is None:
+            raise TypeError(f"{type(self).__name__} does not define TEMPLATE_NAME")
+        return get_template(self.TEMPLATE_NAME)
+
+    def export_many(self, testcases: list[TestCase], output_root: Path) -> list[Path]:
+        """
+        Export several test cases, each into ``output_root / testcase.id``.
+
+        Exporters reuse their compiled template across the batch; subclasses
+        may override this to share other resources as well.
+
+        Args:
+            testcases: TestCase objects to export
+            output_root: Directory that gets one subdirectory per test case id
+
+        Returns:
+            Paths to the created files, in input order
+        """
+        paths: list[Path] = []
+        for testcase in testcases:
+            output_dir = output_root / testcase.id
+            output_dir.mkdir(parents=True, exist_ok=True)
+            paths.append(self.export(testcase, output_dir))
+        return paths
 
     @abstractmethod
     def export(self, testcase: TestCase, output_dir: Path) -> Path:
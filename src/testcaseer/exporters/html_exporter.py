@@ -1,21 +1,54 @@
 """HTML exporter for test cases."""
 
-import base64
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any
 
-from jinja2 import Environment, PackageLoader
+from testcaseer.exporters.base import BaseExporter, _write_if_changed
+from testcaseer.models import TestCase
 
-from testcaseer.exporters.base import BaseExporter
-from testcaseer.models import Step, TestCase
+# Multiple of 3 bytes, so chunks encode without padding and concatenate cleanly
+_B64_CHUNK_SIZE = 57 * 1024
+
+
+def _encode_file_base64(path: Path) -> str:
+    """
+    Base64-encode a file chunk by chunk.
+
+    Only one chunk of raw bytes is held at a time instead of the whole file
+    next to its encoded copy.
+
+    Args:
+        path: File to encode
+
+    Returns:
+        Base64 text of the file contents
+    """
+    import base64
+
+    buf = bytearray()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_B64_CHUNK_SIZE), b""):
+            buf += base64.b64encode(chunk)
+    return buf.decode("ascii")
+
+
+_IMAGE_MIME_TYPES = {".webp": "image/webp", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+
+def _image_mime_type(path: Path) -> str:
+    """Get the MIME type of a screenshot from its extension (PNG if unknown)."""
+    return _IMAGE_MIME_TYPES.get(path.suffix.lower(), "image/png")
 
 
 class HTMLExporter(BaseExporter):
     """Export test cases to HTML format with embedded screenshots."""
 
-    def __init__(self) -> None:
-        """Initialize the HTML exporter with Jinja2 environment."""
-        self.env = Environment(loader=PackageLoader("testcaseer", "templates"))
+    TEMPLATE_NAME = "report.html.j2"
+
+    # Pool shared by all exports inside export_many(); None outside of it
+    _executor: ThreadPoolExecutor | None = None
 
     def export(self, testcase: TestCase, output_dir: Path) -> Path:
         """
@@ -29,40 +62,64 @@ class HTMLExporter(BaseExporter):
             Path to the created HTML file
         """
         output_path = output_dir / "testcase.html"
+        testcase = self.prepare(testcase)
 
-        template = self.env.get_template("report.html.j2")
+        # Convert screenshots to base64 for embedding. Steps are rendered as
+        # models: plain attribute access is much cheaper in Jinja than dumping
+        # them to dicts, which Jinja only reaches after a failed getattr
+        screenshots = self._embed_screenshots(testcase, output_dir)
 
-        # Convert screenshots to base64 for embedding
-        steps_with_images = self._embed_screenshots(testcase.steps, output_dir)
+        content = self.template.render(testcase=testcase, screenshots=screenshots)
 
-        content = template.render(testcase=testcase, steps=steps_with_images)
-
-        output_path.write_text(content, encoding="utf-8")
+        _write_if_changed(output_path, content.encode("utf-8"))
         return output_path
 
-    def _embed_screenshots(self, steps: list[Step], output_dir: Path) -> list[dict[str, Any]]:
+    def export_many(self, testcases: list[TestCase], output_root: Path) -> list[Path]:
         """
-        Convert screenshot paths to base64 data URLs.
+        Export several test cases, encoding screenshots on one shared pool.
 
         Args:
-            steps: List of Step objects
-            output_dir: Base directory for screenshot paths
+            testcases: TestCase objects to export
+            output_root: Directory that gets one subdirectory per test case id
 
         Returns:
-            List of step dictionaries with embedded screenshot data
+            Paths to the created HTML files, in input order
         """
-        result: list[dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            self._executor = executor
+            try:
+                return super().export_many(testcases, output_root)
+            finally:
+                self._executor = None
+
+    def _embed_screenshots(self, testcase: TestCase, output_dir: Path) -> dict[int, str]:
+        """
+        Convert screenshot paths to base64 data URLs.
 
-        for step in steps:
-            step_dict = step.model_dump()
+        Args:
+            testcase: TestCase whose screenshots to convert
+            output_dir: Base directory for screenshot paths
 
+        Returns:
+            Data URLs keyed by step number, for screenshots found on disk
+        """
+        # (step number, path) of every screenshot that is actually on disk
+        pending: list[tuple[int, Path]] = []
+        for step in testcase.steps:
             if step.screenshot_path:
                 full_path = output_dir / step.screenshot_path
                 if full_path.exists():
-                    with open(full_path, "rb") as f:
-                        b64 = base64.b64encode(f.read()).decode()
-                        step_dict["screenshot_base64"] = f"data:image/png;base64,{b64}"
-
-            result.append(step_dict)
-
-        return result
+                    pending.append((step.number, full_path))
+
+        if not pending:
+            return {}
+
+        # Reads are I/O and b64encode releases the GIL, so threads overlap both
+        workers = min(len(pending), os.cpu_count() or 1)
+        pool = nullcontext(self._executor) if self._executor else ThreadPoolExecutor(workers)
+        with pool as executor:
+            encoded = executor.map(_encode_file_base64, [path for _, path in pending])
+            return {
+                number: f"data:{_image_mime_type(path)};base64,{b64}"
+                for (number, path), b64 in zip(pending, encoded, strict=True)
+            }
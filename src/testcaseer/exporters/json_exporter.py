@@ -1,15 +1,34 @@
 """JSON exporter for test cases."""
 
-import json
 from pathlib import Path
 
-from testcaseer.exporters.base import BaseExporter
+from pydantic import TypeAdapter
+
+from testcaseer.exporters.base import BaseExporter, _write_if_changed
 from testcaseer.models import TestCase
 
+# dump_json returns UTF-8 bytes straight from pydantic-core, skipping the
+# intermediate str that model_dump_json would build
+_TESTCASE_JSON = TypeAdapter(TestCase)
+
 
 class JSONExporter(BaseExporter):
     """Export test cases to JSON format."""
 
+    def __init__(self, dedupe: bool = False) -> None:
+        """
+        Initialize the exporter.
+
+        Unlike the reports, JSON keeps one entry per event unless asked, so
+        tools reading it see every log and request. Each entry still carries
+        ``count`` (1 when nothing was merged).
+
+        Args:
+            dedupe: Merge identical consecutive console logs and network
+                requests into one entry with a count
+        """
+        super().__init__(dedupe=dedupe)
+
     def export(self, testcase: TestCase, output_dir: Path) -> Path:
         """
         Export test case to JSON file.
@@ -22,11 +41,9 @@ class JSONExporter(BaseExporter):
             Path to the created JSON file
         """
         output_path = output_dir / "testcase.json"
+        testcase = self.prepare(testcase)
 
-        # Pydantic v2: model_dump with JSON serialization mode
-        data = testcase.model_dump(mode="json")
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Non-ASCII text is kept as UTF-8, like json.dump(ensure_ascii=False)
+        _write_if_changed(output_path, _TESTCASE_JSON.dump_json(testcase, indent=2))
 
         return output_path
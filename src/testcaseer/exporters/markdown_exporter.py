@@ -2,18 +2,14 @@
 
 from pathlib import Path
 
-from jinja2 import Environment, PackageLoader
-
-from testcaseer.exporters.base import BaseExporter
+from testcaseer.exporters.base import BaseExporter, _write_if_changed
 from testcaseer.models import TestCase
 
 
 class MarkdownExporter(BaseExporter):
     """Export test cases to Markdown format."""
 
-    def __init__(self) -> None:
-        """Initialize the Markdown exporter with Jinja2 environment."""
-        self.env = Environment(loader=PackageLoader("testcaseer", "templates"))
+    TEMPLATE_NAME = "report.md.j2"
 
     def export(self, testcase: TestCase, output_dir: Path) -> Path:
         """
@@ -27,9 +23,9 @@ class MarkdownExporter(BaseExporter):
             Path to the created Markdown file
         """
         output_path = output_dir / "testcase.md"
+        testcase = self.prepare(testcase)
 
-        template = self.env.get_template("report.md.j2")
-        content = template.render(testcase=testcase)
+        content = self.template.render(testcase=testcase)
 
-        output_path.write_text(content, encoding="utf-8")
+        _write_if_changed(output_path, content.encode("utf-8"))
         return output_path
@@ -1,10 +1,11 @@
 """Pydantic models for TestCaseer data structures."""
 
+from collections.abc import Callable, Hashable
 from datetime import datetime
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class ElementInfo(BaseModel):
@@ -16,7 +17,15 @@ class ElementInfo(BaseModel):
     text: str | None = Field(default=None, description="Text content of the element")
     placeholder: str | None = Field(default=None, description="Placeholder for input elements")
     attributes: dict[str, str] = Field(default_factory=dict, description="HTML attributes")
-    bounding_box: dict[str, float] = Field(description="Coordinates: x, y, width, height")
+    bounding_box: dict[str, int] = Field(description="Coordinates: x, y, width, height")
+
+    @field_validator("bounding_box", mode="before")
+    @classmethod
+    def _round_bounding_box(cls, value: Any) -> Any:
+        """Round coordinates to whole pixels; sub-pixel precision is never used."""
+        if isinstance(value, dict):
+            return {k: round(v) if isinstance(v, float) else v for k, v in value.items()}
+        return value
 
 
 class NetworkRequest(BaseModel):
@@ -33,6 +42,7 @@ class NetworkRequest(BaseModel):
     request_body: str | None = Field(default=None, description="Request body (for POST/PUT)")
     response_body: str | None = Field(default=None, description="Response body preview")
     error: str | None = Field(default=None, description="Error message if request failed")
+    count: int = Field(default=1, description="Identical consecutive requests merged into this one")
 
 
 ConsoleLogLevel = Literal["log", "info", "warn", "error", "debug", "trace"]
@@ -46,6 +56,47 @@ class ConsoleLog(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now, description="Log time")
     source: str | None = Field(default=None, description="Source file and line")
     args: list[str] = Field(default_factory=list, description="Additional arguments")
+    count: int = Field(default=1, description="Identical consecutive logs merged into this one")
+
+
+def _coalesce[E: (ConsoleLog, NetworkRequest)](
+    entries: list[E], key: Callable[[E], Hashable]
+) -> list[E]:
+    """
+    Merge runs of consecutive entries with the same key into their first entry.
+
+    Args:
+        entries: Log or request entries in timeline order
+        key: Returns what makes two entries identical
+
+    Returns:
+        Entries with each run replaced by its first entry, counting the run
+    """
+    runs: list[tuple[E, int]] = []
+    last_key: Hashable = None
+    for entry in entries:
+        entry_key = key(entry)
+        if runs and entry_key == last_key:
+            first, count = runs[-1]
+            runs[-1] = (first, count + entry.count)
+        else:
+            runs.append((entry, entry.count))
+            last_key = entry_key
+
+    return [
+        first if count == first.count else first.model_copy(update={"count": count})
+        for first, count in runs
+    ]
+
+
+def _log_key(log: ConsoleLog) -> Hashable:
+    """Identify repeats of a console log."""
+    return (log.level, log.message)
+
+
+def _request_key(request: NetworkRequest) -> Hashable:
+    """Identify repeats of a network request."""
+    return (request.method, request.url, request.status)
 
 
 class PageError(BaseModel):
@@ -128,3 +179,63 @@ class TestCase(BaseModel):
     # Summary
     total_duration: float = Field(description="Total recording duration in seconds")
     total_steps: int = Field(description="Total number of steps")
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TestCase":
+        """
+        Load a test case from a dict, e.g. a previously exported JSON document.
+
+        The whole tree, including every step, log and request, is validated in
+        a single pydantic-core pass instead of building models one by one.
+
+        Args:
+            data: Test case fields as produced by ``model_dump``
+
+        Returns:
+            Validated TestCase
+        """
+        return cls.model_validate(data)
+
+    @classmethod
+    def from_json(cls, data: str | bytes) -> "TestCase":
+        """
+        Load a test case straight from exported JSON.
+
+        Parses and validates in one step, without an intermediate dict.
+
+        Args:
+            data: Contents of a ``testcase.json`` export
+
+        Returns:
+            Validated TestCase
+        """
+        return cls.model_validate_json(data)
+
+    def collapse_repeats(self) -> "TestCase":
+        """
+        Get a copy with identical consecutive timeline entries merged.
+
+        Polling requests and repeated console messages collapse into one
+        entry whose ``count`` says how many times it occurred in a row.
+        Logs match on (level, message), requests on (method, url, status).
+        Both the full timeline and each step's own lists are collapsed.
+
+        Returns:
+            New TestCase with collapsed console_logs and network_requests
+        """
+        steps = [
+            step.model_copy(
+                update={
+                    "console_logs": _coalesce(step.console_logs, _log_key),
+                    "network_requests": _coalesce(step.network_requests, _request_key),
+                }
+            )
+            for step in self.steps
+        ]
+        return self.model_copy(
+            update={
+                "steps": steps,
+                "console_logs": _coalesce(self.console_logs, _log_key),
+                "network_requests": _coalesce(self.network_requests, _request_key),
+            }
+        )
@@ -1,19 +1,26 @@
 """Main recorder class for TestCaseer."""
 
+from __future__ import annotations
+
 import asyncio
 import contextlib
+import functools
+import os
+import sys
+import time
 import uuid
+import warnings
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Mapping
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Final
 
-from playwright.async_api import ConsoleMessage, Request, Response
 from rich.console import Console
 
-from testcaseer.browser import BrowserManager
-from testcaseer.control_panel import CONTROL_PANEL_JS, inject_control_panel, update_panel_ui
-from testcaseer.events import EVENT_LISTENER_JS, parse_element_info, setup_event_listeners
-from testcaseer.exporters import HTMLExporter, JSONExporter, MarkdownExporter
+from testcaseer.browser import BrowserManager, BrowserPool
+from testcaseer.control_panel import PanelUpdater, get_control_panel_js, inject_control_panel
+from testcaseer.events import parse_element_info, setup_event_listeners
 from testcaseer.models import (
     ActionType,
     ConsoleLog,
@@ -24,10 +31,133 @@ from testcaseer.models import (
     Step,
     TestCase,
 )
-from testcaseer.screenshot import generate_screenshot_filename, take_screenshot
+from testcaseer.screenshot import (
+    capture_screenshot,
+    generate_screenshot_filename,
+    save_screenshot,
+)
+
+if TYPE_CHECKING:
+    from playwright.async_api import ConsoleMessage, Request, Response
 
 console = Console()
 
+# Playwright console message types mapped to our log levels
+_LEVEL_MAP: Final[dict[str, ConsoleLogLevel]] = {
+    "log": "log",
+    "info": "info",
+    "warning": "warn",
+    "error": "error",
+    "debug": "debug",
+    "trace": "trace",
+}
+
+# Where screenshots go, relative to the output directory (as stored in steps)
+SCREENSHOTS_SUBDIR: Final = Path("screenshots")
+
+# How far into a request URL to look for the "__testcaseer" internal marker
+_INTERNAL_MARKER_SCAN: Final = 200
+
+# Short step descriptions that only need the element's identifier
+_DESCRIPTION_TEMPLATES: Final[dict[ActionType, str]] = {
+    "click": "Click on '{identifier}'",
+    "dblclick": "Double-click on '{identifier}'",
+    "check": "Check {identifier}",
+    "uncheck": "Uncheck {identifier}",
+}
+
+# Export format -> (label, exporter class name in testcaseer.exporters)
+EXPORT_FORMATS: Final[dict[str, tuple[str, str]]] = {
+    "json": ("JSON", "JSONExporter"),
+    "markdown": ("Markdown", "MarkdownExporter"),
+    "html": ("HTML", "HTMLExporter"),
+}
+
+# DOM event types from the page script mapped to step action types
+_ACTION_MAP: Final[dict[str, ActionType]] = {
+    "click": "click",
+    "dblclick": "dblclick",
+    "input": "input",
+    "select": "select",
+    "check": "check",
+    "uncheck": "uncheck",
+    "keypress": "keypress",
+}
+
+
+def _content_length(headers: dict[str, str]) -> int | None:
+    """
+    Get the body size a response declares in its headers.
+
+    Args:
+        headers: Response headers (Playwright lower-cases the names)
+
+    Returns:
+        Size in bytes, or None if missing or malformed
+    """
+    try:
+        return int(headers["content-length"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _capture_api_name_only() -> dict[str, Any]:
+    """
+    Cheap stand-in for Playwright's per-call stack capture.
+
+    Playwright walks the caller's stack on every API call and reads each
+    frame's locals to name the call and record source locations. This keeps
+    the API name, taken from code objects only, and records no frames, so
+    traces lose their source locations. Without the frame locals the name
+    comes from ``co_qualname``, i.e. the class that defines the method
+    (e.g. ``ChannelOwner._send``) rather than the runtime class Playwright
+    itself reports.
+
+    Returns:
+        Stack information in the shape Playwright expects
+    """
+    from playwright._impl import _connection, _impl_to_api_mapping
+
+    frame = sys._getframe(2)
+    api_name = last_internal = ""
+    while frame:
+        filename = frame.f_code.co_filename
+        if filename == _impl_to_api_mapping.__file__:
+            pass
+        elif filename.startswith(_connection._PLAYWRIGHT_MODULE_PATH):
+            last_internal = frame.f_code.co_qualname
+        elif last_internal:
+            api_name, last_internal = last_internal, ""
+        frame = frame.f_back  # type: ignore[assignment]
+
+    return {"frames": [], "apiName": api_name or last_internal, "title": None}
+
+
+def _disable_playwright_stack_capture() -> None:
+    """
+    Replace Playwright's stack capture with ``_capture_api_name_only``.
+
+    Older Playwright releases walk the stack inline in ``wrap_api_call`` and
+    have no helper to replace; they keep capturing and a warning says so.
+    """
+    from playwright._impl import _connection
+
+    if not hasattr(_connection, "_capture_stack_trace"):
+        warnings.warn(
+            "TESTCASEER_PW_INSPECT_STACK=0 has no effect: this Playwright version "
+            "has no replaceable stack capture",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return
+
+    _connection._capture_stack_trace = _capture_api_name_only  # type: ignore[assignment]
+
+
+# Opt-in: network-heavy pages make thousands of Playwright calls per session
+if os.environ.get("TESTCASEER_PW_INSPECT_STACK") == "0":
+    _disable_playwright_stack_capture()
+
 
 class Recorder:
     """
@@ -46,6 +176,20 @@ class Recorder:
         await recorder.run()
     """
 
+    # Typing in a field is recorded once it has been idle this long (seconds),
+    # and at the latest this long after the first keystroke
+    INPUT_IDLE_DELAY = 0.25
+    INPUT_MAX_DELAY = 2.0
+
+    # Per-event terminal lines are batched and written at most this often (seconds)
+    EVENT_LOG_INTERVAL = 0.1
+
+    # Requests still waiting for a response; the oldest are dropped past this
+    MAX_PENDING_REQUESTS = 512
+
+    # XHR/fetch response bodies larger than this (bytes) are not captured
+    MAX_RESPONSE_BODY_SIZE = 50 * 1024
+
     def __init__(
         self,
         output_dir: Path,
@@ -55,6 +199,10 @@ class Recorder:
         headless: bool = False,
         viewport: tuple[int, int] = (1280, 720),
         timeout: int = 30000,
+        browser_pool: BrowserPool | None = None,
+        formats: Collection[str] = tuple(EXPORT_FORMATS),
+        capture_console_args: bool = False,
+        header_allowlist: Collection[str] | None = None,
     ) -> None:
         """
         Initialize the recorder.
@@ -67,14 +215,35 @@ class Recorder:
             headless: Run browser without GUI
             viewport: Browser window size (width, height)
             timeout: Default timeout for operations in ms
+            browser_pool: Shared pool to reuse a running browser across sessions
+            formats: Export formats to write (json, markdown, html)
+            capture_console_args: Also store each console message's arguments
+            header_allowlist: HTTP header names to keep on network requests
+                (case-insensitive); None keeps every header
+
+        Raises:
+            ValueError: If an unknown export format is requested
         """
+        requested = set(formats)
+        unknown = requested - EXPORT_FORMATS.keys()
+        if unknown:
+            raise ValueError(f"Unknown export format(s): {', '.join(sorted(unknown))}")
+
         self.output_dir = Path(output_dir).resolve()
+        self._screenshots_dir = self.output_dir / SCREENSHOTS_SUBDIR
         self.start_url = start_url
         self.name = name
         self.browser_type = browser_type
         self.headless = headless
         self.viewport = viewport
         self.timeout = timeout
+        self.browser_pool = browser_pool
+        self.capture_console_args = capture_console_args
+        self.header_allowlist = (
+            None if header_allowlist is None else frozenset(h.lower() for h in header_allowlist)
+        )
+        # Keep the canonical order so output is listed consistently
+        self.formats = [fmt for fmt in EXPORT_FORMATS if fmt in requested]
 
         # Recording state
         self.is_recording = False
@@ -86,12 +255,36 @@ class Recorder:
         self.console_logs: list[ConsoleLog] = []
         self.network_requests: list[NetworkRequest] = []
         self.page_errors: list[PageError] = []
-        self._pending_requests: dict[str, tuple[NetworkRequest, Request]] = {}
+        # Keyed by id() of the Playwright request, which the stored tuple keeps alive
+        self._pending_requests: OrderedDict[int, tuple[NetworkRequest, Request]] = OrderedDict()
         self._step_console_logs: list[ConsoleLog] = []  # Logs for current step
         self._step_network_requests: list[NetworkRequest] = []  # Requests for current step
 
+        # Input events waiting to be recorded, keyed by selector:
+        # (latest event data, flush timer, loop time of the first event)
+        self._pending_inputs: dict[str, tuple[dict[str, Any], asyncio.TimerHandle, float]] = {}
+        self._input_tasks: set[asyncio.Task[None]] = set()
+        # Serializes step creation so step numbers and order stay consistent
+        self._record_lock = asyncio.Lock()
+
+        # Captured screenshots waiting to be written to disk:
+        # (PNG bytes, file path, box of the element to highlight)
+        self._screenshot_queue: asyncio.Queue[tuple[bytes, Path, Mapping[str, float] | None]] = (
+            asyncio.Queue()
+        )
+        self._screenshot_worker: asyncio.Task[None] | None = None
+
+        # XHR/fetch responses whose bodies are still to be read
+        self._body_queue: asyncio.Queue[tuple[Response, NetworkRequest]] = asyncio.Queue()
+        self._body_worker: asyncio.Task[None] | None = None
+
+        # Terminal lines for page events and steps, waiting to be printed
+        self._event_log: list[str] = []
+        self._event_log_flush: asyncio.TimerHandle | None = None
+
         # Browser manager
         self._browser_manager: BrowserManager | None = None
+        self._panel_updater: PanelUpdater | None = None
 
         # Control flags
         self._stop_event = asyncio.Event()
@@ -100,7 +293,7 @@ class Recorder:
     @property
     def screenshots_dir(self) -> Path:
         """Get the screenshots directory."""
-        return self.output_dir / "screenshots"
+        return self._screenshots_dir
 
     async def run(self) -> None:
         """
@@ -109,8 +302,8 @@ class Recorder:
         Opens the browser, injects the control panel, and waits for user
         to start/stop recording via the UI controls.
         """
-        # Prepare output directory
-        self._prepare_output_dir()
+        # Without a shared pool this session owns its own and closes it at the end
+        pool = self.browser_pool if self.browser_pool is not None else BrowserPool()
 
         # Create browser manager
         self._browser_manager = BrowserManager(
@@ -118,28 +311,43 @@ class Recorder:
             headless=self.headless,
             viewport=self.viewport,
             timeout=self.timeout,
+            pool=pool,
         )
 
         try:
-            # Start browser
-            page = await self._browser_manager.start()
-            console.print("[green]✓[/green] Browser launched")
-
-            # Set up event handlers for page events
+            # Start browser; file system prep runs in a thread while the
+            # browser process spawns
+            started = time.perf_counter()
+            start_task = asyncio.create_task(self._browser_manager.start())
+            try:
+                await asyncio.to_thread(self._prepare_session)
+                page = await start_task
+            except BaseException:
+                # Don't leave the launch running; errors keep their own type
+                start_task.cancel()
+                with contextlib.suppress(Exception, asyncio.CancelledError):
+                    await start_task
+                raise
+            elapsed = time.perf_counter() - started
+            console.print(f"[green]✓[/green] Browser launched [dim]({elapsed:.2f}s)[/dim]")
+
+            # Restore panel state after each navigation
             page.on("load", self._on_page_load)
-            page.on("domcontentloaded", self._on_dom_ready)
 
-            # Set up console and network listeners
-            page.on("console", self._on_console_message)
-            page.on("pageerror", self._on_page_error)
-            page.on("request", self._on_request)
-            page.on("response", self._on_response)
-            page.on("requestfailed", self._on_request_failed)
+            # Set up console and network listeners, all behind one recording gate
+            def gated(handler: Callable[[Any], None]) -> Callable[[Any], None]:
+                return functools.partial(self._dispatch_page_event, handler)
+
+            page.on("console", gated(self._on_console_message))
+            page.on("pageerror", gated(self._on_page_error))
+            page.on("request", gated(self._on_request))
+            page.on("response", gated(self._on_response))
+            page.on("requestfailed", gated(self._on_request_failed))
 
             console.print("[green]✓[/green] Console & network listeners attached")
 
             # Set up control panel and event listeners
-            await inject_control_panel(page, self)
+            self._panel_updater = await inject_control_panel(page, self)
             await setup_event_listeners(page, self)
             console.print("[green]✓[/green] Control panel injected")
 
@@ -147,6 +355,8 @@ class Recorder:
             await self._browser_manager.navigate(self.start_url)
             console.print(f"[green]✓[/green] Navigated to {self.start_url}")
 
+            # navigate() returns at commit, before the document has a title
+            await page.wait_for_load_state("domcontentloaded")
             page_title = await page.title()
             if page_title:
                 console.print(f"[green]✓[/green] Page loaded: {page_title}")
@@ -160,42 +370,112 @@ class Recorder:
 
         finally:
             # Cleanup
+            self._flush_event_log()
+
+            for worker in (self._screenshot_worker, self._body_worker):
+                if worker:
+                    worker.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await worker
+            self._screenshot_worker = self._body_worker = None
+
+            if self._panel_updater:
+                await self._panel_updater.close()
+                self._panel_updater = None
+
             if self._browser_manager:
                 await self._browser_manager.close()
                 console.print("[green]✓[/green] Browser closed")
 
+            # Also stops a driver left running by a launch that failed part way
+            if self.browser_pool is None:
+                await pool.close()
+
     def _prepare_output_dir(self) -> None:
         """Create output directories."""
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.screenshots_dir.mkdir(parents=True, exist_ok=True)
 
+    def _prepare_session(self) -> None:
+        """Do blocking setup that does not need the browser."""
+        self._prepare_output_dir()
+        # Read and minify the panel script before the first page needs it
+        get_control_panel_js()
+
     # -------------------------------------------------------------------------
     # Console and Network Event Handlers
     # -------------------------------------------------------------------------
 
-    def _on_console_message(self, message: ConsoleMessage) -> None:
-        """Handle console message event."""
-        if not self.is_recording:
+    def _dispatch_page_event(self, handler: Callable[[Any], None], payload: Any) -> None:
+        """
+        Pass a console or network event to its handler while recording.
+
+        Pages keep emitting these events outside recording too; this keeps
+        that path to a single attribute check.
+
+        Args:
+            handler: One of the ``_on_*`` handlers below
+            payload: Event object from Playwright
+        """
+        if self.is_recording:
+            handler(payload)
+
+    def _log_event(self, line: str) -> None:
+        """
+        Queue a terminal line about a page event or recorded step.
+
+        Chatty pages can fire hundreds of events per second; rendering and
+        writing each line separately would stall the event loop on terminal
+        I/O, so lines are printed together every ``EVENT_LOG_INTERVAL``.
+
+        Args:
+            line: Rich markup to print
+        """
+        self._event_log.append(line)
+        if self._event_log_flush is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called outside the event loop; nothing to batch with
+            self._flush_event_log()
             return
+        self._event_log_flush = loop.call_later(self.EVENT_LOG_INTERVAL, self._flush_event_log)
+
+    def _flush_event_log(self) -> None:
+        """Print all queued event lines in one write."""
+        if self._event_log_flush is not None:
+            self._event_log_flush.cancel()
+            self._event_log_flush = None
+        if self._event_log:
+            lines, self._event_log = self._event_log, []
+            console.print("\n".join(lines))
+
+    def _capture_headers(self, headers: dict[str, str]) -> dict[str, str]:
+        """
+        Copy the headers worth keeping for a network request.
 
-        # Map playwright message types to our levels
-        level_map: dict[str, ConsoleLogLevel] = {
-            "log": "log",
-            "info": "info",
-            "warning": "warn",
-            "error": "error",
-            "debug": "debug",
-            "trace": "trace",
-        }
+        Args:
+            headers: Headers from Playwright (names are lower-case)
 
-        level: ConsoleLogLevel = level_map.get(message.type, "log")
+        Returns:
+            All headers, or only the allowlisted ones if an allowlist is set
+        """
+        if self.header_allowlist is None:
+            return dict(headers)
+        return {k: v for k, v in headers.items() if k in self.header_allowlist}
+
+    def _on_console_message(self, message: ConsoleMessage) -> None:
+        """Handle console message event."""
+        level: ConsoleLogLevel = _LEVEL_MAP.get(message.type, "log")
 
         log_entry = ConsoleLog(
             level=level,
             message=message.text,
             timestamp=datetime.now(),
             source=message.location.get("url") if message.location else None,
-            args=[str(arg) for arg in message.args[:5]],  # Limit args
+            # The text already holds the formatted arguments
+            args=[str(arg) for arg in message.args[:5]] if self.capture_console_args else [],
         )
 
         self.console_logs.append(log_entry)
@@ -203,15 +483,12 @@ class Recorder:
 
         # Log to terminal based on level
         if level == "error":
-            console.print(f"    [red]Console Error:[/red] {message.text[:80]}")
+            self._log_event(f"    [red]Console Error:[/red] {message.text[:80]}")
         elif level == "warn":
-            console.print(f"    [yellow]Console Warn:[/yellow] {message.text[:80]}")
+            self._log_event(f"    [yellow]Console Warn:[/yellow] {message.text[:80]}")
 
     def _on_page_error(self, error: Exception) -> None:
         """Handle page JavaScript error."""
-        if not self.is_recording:
-            return
-
         page_error = PageError(
             message=str(error),
             stack=getattr(error, "stack", None),
@@ -219,16 +496,14 @@ class Recorder:
         )
 
         self.page_errors.append(page_error)
-        console.print(f"    [red]JS Error:[/red] {str(error)[:80]}")
+        self._log_event(f"    [red]JS Error:[/red] {str(error)[:80]}")
 
     def _on_request(self, request: Request) -> None:
         """Handle network request start."""
-        if not self.is_recording:
-            return
-
-        # Skip data URLs and internal requests
+        # Skip data URLs and internal requests; the internal marker sits near
+        # the start, so long query strings are never scanned in full
         url = request.url
-        if url.startswith("data:") or "__testcaseer" in url:
+        if url[:5] == "data:" or url.find("__testcaseer", 0, _INTERNAL_MARKER_SCAN) != -1:
             return
 
         # Get request body for POST/PUT/PATCH
@@ -243,27 +518,28 @@ class Recorder:
             url=url,
             resource_type=request.resource_type,
             timestamp=datetime.now(),
-            request_headers=dict(request.headers),
+            request_headers=self._capture_headers(request.headers),
             request_body=request_body,
         )
 
-        # Store pending request to match with response
-        self._pending_requests[url] = (net_request, request)
+        # Store pending request to match with response; requests that never
+        # complete (aborted by navigation, etc.) age out instead of piling up
+        self._pending_requests[id(request)] = (net_request, request)
+        if len(self._pending_requests) > self.MAX_PENDING_REQUESTS:
+            self._pending_requests.popitem(last=False)
 
     def _on_response(self, response: Response) -> None:
         """Handle network response."""
-        if not self.is_recording:
-            return
-
         url = response.url
 
         # Find matching request
-        if url in self._pending_requests:
-            net_request, original_request = self._pending_requests.pop(url)
+        pending = self._pending_requests.pop(id(response.request), None)
+        if pending is not None:
+            net_request, _ = pending
 
             # Update with response data
             net_request.status = response.status
-            net_request.response_headers = dict(response.headers)
+            net_request.response_headers = self._capture_headers(response.headers)
 
             # Calculate timing
             timing = response.request.timing
@@ -273,28 +549,60 @@ class Recorder:
             # For XHR/fetch requests, try to capture response body
             if net_request.resource_type in ("xhr", "fetch"):
                 # Schedule async body capture
-                asyncio.create_task(self._capture_response_body(response, net_request))
+                self._queue_response_body(response, net_request)
             else:
                 # Add to lists immediately for non-XHR requests
-                self.network_requests.append(net_request)
-                self._step_network_requests.append(net_request)
+                self._finalize_request(net_request)
 
             # Log significant requests
             if response.status >= 400:
-                console.print(
+                self._log_event(
                     f"    [red]HTTP {response.status}:[/red] {net_request.method} {url[:60]}"
                 )
             elif net_request.resource_type in ("xhr", "fetch"):
-                console.print(
+                self._log_event(
                     f"    [dim]API {response.status}:[/dim] {net_request.method} {url[:60]}"
                 )
 
+    def _finalize_request(self, net_request: NetworkRequest) -> None:
+        """Record a completed request in the timeline and the current step."""
+        self.network_requests.append(net_request)
+        self._step_network_requests.append(net_request)
+
+    def _queue_response_body(self, response: Response, net_request: NetworkRequest) -> None:
+        """
+        Hand an XHR/fetch response to the background body reader.
+
+        Args:
+            response: Playwright response whose body to read
+            net_request: Request entry to complete with the body
+        """
+        self._body_queue.put_nowait((response, net_request))
+        if self._body_worker is None or self._body_worker.done():
+            self._body_worker = asyncio.create_task(self._drain_response_bodies())
+
+    async def _drain_response_bodies(self) -> None:
+        """Read queued response bodies one at a time, in arrival order."""
+        while True:
+            response, net_request = await self._body_queue.get()
+            try:
+                await self._capture_response_body(response, net_request)
+            finally:
+                self._body_queue.task_done()
+
     async def _capture_response_body(self, response: Response, net_request: NetworkRequest) -> None:
         """Capture response body for XHR/fetch requests asynchronously."""
         try:
-            # Try to get response body (limit to 50KB to avoid huge responses)
+            # A declared size over the limit means the body is never fetched
+            # over the Playwright connection at all
+            declared_size = _content_length(response.headers)
+            if declared_size is not None and declared_size > self.MAX_RESPONSE_BODY_SIZE:
+                net_request.response_body = f"[Large response, {declared_size} bytes]"
+                return
+
+            # Try to get response body (limit size to avoid huge responses)
             body_bytes = await response.body()
-            if len(body_bytes) <= 50 * 1024:  # 50KB limit
+            if len(body_bytes) <= self.MAX_RESPONSE_BODY_SIZE:
                 try:
                     # Try to decode as text
                     body_text = body_bytes.decode("utf-8")
@@ -310,24 +618,20 @@ class Recorder:
             net_request.response_body = f"[Error capturing body: {e}]"
         finally:
             # Add to lists after body capture
-            self.network_requests.append(net_request)
-            self._step_network_requests.append(net_request)
+            self._finalize_request(net_request)
 
     def _on_request_failed(self, request: Request) -> None:
         """Handle failed network request."""
-        if not self.is_recording:
-            return
-
         url = request.url
 
-        if url in self._pending_requests:
-            net_request, _ = self._pending_requests.pop(url)
+        pending = self._pending_requests.pop(id(request), None)
+        if pending is not None:
+            net_request, _ = pending
             net_request.error = request.failure or "Request failed"
 
-            self.network_requests.append(net_request)
-            self._step_network_requests.append(net_request)
+            self._finalize_request(net_request)
 
-            console.print(f"    [red]Request Failed:[/red] {net_request.method} {url[:60]}")
+            self._log_event(f"    [red]Request Failed:[/red] {net_request.method} {url[:60]}")
 
     # -------------------------------------------------------------------------
     # Page Navigation Handlers
@@ -335,22 +639,10 @@ class Recorder:
 
     async def _on_page_load(self, _: Any) -> None:
         """Handle page load event."""
-        if self._browser_manager and self._browser_manager._page:
-            # Re-inject control panel and event listeners
-            try:
-                await self._browser_manager._page.evaluate(CONTROL_PANEL_JS)
-                await self._browser_manager._page.evaluate(EVENT_LISTENER_JS)
-                await update_panel_ui(
-                    self._browser_manager._page,
-                    self.is_recording,
-                    len(self.steps),
-                )
-            except Exception:
-                pass
-
-    async def _on_dom_ready(self, _: Any) -> None:
-        """Handle DOM content loaded event."""
-        pass
+        # Panel and event listeners come from init scripts; only the panel
+        # state needs restoring in the fresh document
+        if self._panel_updater:
+            await self._panel_updater.send(self.is_recording, len(self.steps))
 
     # -------------------------------------------------------------------------
     # Recording Control
@@ -377,12 +669,8 @@ class Recorder:
         console.print("[dim]Console logs and network requests are being captured.[/dim]\n")
 
         # Update UI
-        if self._browser_manager and self._browser_manager._page:
-            await update_panel_ui(
-                self._browser_manager._page,
-                is_recording=True,
-                steps_count=0,
-            )
+        if self._panel_updater:
+            await self._panel_updater.send(is_recording=True, steps_count=0)
 
     async def stop_recording(self) -> None:
         """
@@ -395,18 +683,24 @@ class Recorder:
             self._recording_complete.set()
             return
 
+        # Record whatever was typed right before Stop was clicked
+        await self._flush_pending_inputs()
+        # The exporters read the screenshot files and the response bodies
+        await self._screenshot_queue.join()
+        await self._body_queue.join()
+
         self.is_recording = False
         self.end_time = datetime.now()
 
+        self._flush_event_log()
         console.print("\n[bold green]■ Recording stopped[/bold green]")
         console.print(f"[dim]Recorded {len(self.steps)} steps[/dim]")
         console.print(f"[dim]Captured {len(self.console_logs)} console logs[/dim]")
         console.print(f"[dim]Captured {len(self.network_requests)} network requests[/dim]")
 
         # Update UI
-        if self._browser_manager and self._browser_manager._page:
-            await update_panel_ui(
-                self._browser_manager._page,
+        if self._panel_updater:
+            await self._panel_updater.send(
                 is_recording=False,
                 steps_count=len(self.steps),
                 message="Saving...",
@@ -416,9 +710,8 @@ class Recorder:
         await self._export_testcase()
 
         # Update UI with completion message
-        if self._browser_manager and self._browser_manager._page:
-            await update_panel_ui(
-                self._browser_manager._page,
+        if self._panel_updater:
+            await self._panel_updater.send(
                 is_recording=False,
                 steps_count=len(self.steps),
                 message="✓ Saved!",
@@ -446,20 +739,82 @@ class Recorder:
         if not self.is_recording:
             return
 
+        # Typing arrives as a stream of input events; coalesce them per field
+        if data.get("eventType") == "input":
+            self._queue_input(data)
+            return
+
+        # Any other action ends the typing that preceded it
+        await self._flush_pending_inputs()
+        await self._record_action(data)
+
+    def _queue_input(self, data: dict[str, Any]) -> None:
+        """
+        Hold an input event until its field has been idle for a moment.
+
+        A newer event for the same selector replaces the held one and restarts
+        the idle timer, but never pushes the flush past INPUT_MAX_DELAY from
+        the first event.
+
+        Args:
+            data: Input event data from JavaScript
+        """
+        loop = asyncio.get_running_loop()
+        selector = data.get("selector", "")
+        first_seen = loop.time()
+
+        pending = self._pending_inputs.pop(selector, None)
+        if pending is not None:
+            _, handle, first_seen = pending
+            handle.cancel()
+
+        remaining = first_seen + self.INPUT_MAX_DELAY - loop.time()
+        delay = max(0.0, min(self.INPUT_IDLE_DELAY, remaining))
+        handle = loop.call_later(delay, self._flush_input, selector)
+        self._pending_inputs[selector] = (data, handle, first_seen)
+
+    def _flush_input(self, selector: str) -> None:
+        """Record the held input event for a selector (timer callback)."""
+        pending = self._pending_inputs.pop(selector, None)
+        if pending is None:
+            return
+
+        task = asyncio.create_task(self._record_action(pending[0]))
+        self._input_tasks.add(task)
+        task.add_done_callback(self._input_tasks.discard)
+
+    async def _flush_pending_inputs(self) -> None:
+        """Record all held input events now, in the order they were typed."""
+        # Inputs already handed off by their timers come first
+        if self._input_tasks:
+            await asyncio.gather(*self._input_tasks)
+
+        pending = list(self._pending_inputs.values())
+        self._pending_inputs.clear()
+        for data, handle, _ in pending:
+            handle.cancel()
+            await self._record_action(data)
+
+    async def _record_action(self, data: dict[str, Any]) -> None:
+        """
+        Turn an action event into a recorded step.
+
+        Args:
+            data: Action data from JavaScript
+        """
+        async with self._record_lock:
+            await self._create_step(data)
+
+    async def _create_step(self, data: dict[str, Any]) -> None:
+        """
+        Build a step with screenshot, logs and requests and append it.
+
+        Args:
+            data: Action data from JavaScript
+        """
         event_type = data.get("eventType", "")
 
-        # Map event types to action types
-        action_map: dict[str, ActionType] = {
-            "click": "click",
-            "dblclick": "dblclick",
-            "input": "input",
-            "select": "select",
-            "check": "check",
-            "uncheck": "uncheck",
-            "keypress": "keypress",
-        }
-
-        action_type = action_map.get(event_type)
+        action_type = _ACTION_MAP.get(event_type)
         if not action_type:
             return
 
@@ -480,7 +835,7 @@ class Recorder:
                 ),
             )
         except Exception as e:
-            console.print(f"[yellow]Warning: Failed to parse element: {e}[/yellow]")
+            self._log_event(f"[yellow]Warning: Failed to parse element: {e}[/yellow]")
             return
 
         # Generate step number
@@ -488,7 +843,7 @@ class Recorder:
 
         # Generate descriptions
         description_short = self._generate_short_description(action_type, element, data)
-        description_detailed = self._generate_detailed_description(action_type, element, data)
+        description_detailed = self._generate_detailed_description(description_short, element)
 
         # Take screenshot
         screenshot_path: Path | None = None
@@ -500,20 +855,18 @@ class Recorder:
                     element.attributes.get("id") or element.tag_name,
                 )
                 full_path = self.screenshots_dir / filename
-                await take_screenshot(
-                    self._browser_manager._page,
-                    full_path,
-                    highlight_selector=element.selector,
-                )
-                screenshot_path = Path("screenshots") / filename
+                data_png = await capture_screenshot(self._browser_manager._page)
+                # The box the listener measured outlines just this element,
+                # even when its selector matches several
+                self._queue_screenshot(data_png, full_path, element.bounding_box)
+                screenshot_path = SCREENSHOTS_SUBDIR / filename
             except Exception as e:
-                console.print(f"[yellow]Warning: Screenshot failed: {e}[/yellow]")
+                self._log_event(f"[yellow]Warning: Screenshot failed: {e}[/yellow]")
 
-        # Collect console logs and network requests for this step
-        step_logs = self._step_console_logs.copy()
-        step_requests = self._step_network_requests.copy()
-        self._step_console_logs.clear()
-        self._step_network_requests.clear()
+        # Collect console logs and network requests for this step; the lists
+        # are handed over and fresh ones started instead of copied and cleared
+        step_logs, self._step_console_logs = self._step_console_logs, []
+        step_requests, self._step_network_requests = self._step_network_requests, []
 
         # Create step
         step = Step(
@@ -533,15 +886,56 @@ class Recorder:
         self.steps.append(step)
 
         # Log the action
-        console.print(f"  [dim]{step_number}.[/dim] {description_short}")
+        self._log_event(f"  [dim]{step_number}.[/dim] {description_short}")
 
-        # Update UI
-        if self._browser_manager and self._browser_manager._page:
-            await update_panel_ui(
-                self._browser_manager._page,
-                is_recording=True,
-                steps_count=len(self.steps),
-            )
+        # Update UI (coalesced, so bursts of actions don't queue evaluates)
+        if self._panel_updater:
+            self._panel_updater.schedule(is_recording=True, steps_count=len(self.steps))
+
+    def _queue_screenshot(
+        self, data: bytes, output_path: Path, box: Mapping[str, float] | None = None
+    ) -> None:
+        """
+        Hand a captured screenshot to the background writer.
+
+        Args:
+            data: PNG bytes of the screenshot
+            output_path: Where to save it
+            box: Bounding box of the element to highlight (optional)
+        """
+        self._screenshot_queue.put_nowait((data, output_path, box))
+        if self._screenshot_worker is None or self._screenshot_worker.done():
+            self._screenshot_worker = asyncio.create_task(self._drain_screenshots())
+
+    async def _drain_screenshots(self) -> None:
+        """Write queued screenshots one at a time, off the event loop."""
+        while True:
+            data, output_path, box = await self._screenshot_queue.get()
+            try:
+                saved_path = await asyncio.to_thread(save_screenshot, data, output_path, box)
+                if saved_path != output_path:
+                    self._retarget_screenshot(output_path, saved_path)
+            except Exception as e:
+                self._log_event(f"[yellow]Warning: Screenshot failed: {e}[/yellow]")
+            finally:
+                self._screenshot_queue.task_done()
+
+    def _retarget_screenshot(self, output_path: Path, saved_path: Path) -> None:
+        """
+        Point the step at the file its screenshot was actually saved to.
+
+        Args:
+            output_path: Path the screenshot was queued for
+            saved_path: Path save_screenshot wrote instead
+        """
+        self._log_event(
+            f"[yellow]Warning: Screenshot kept as PNG, could not encode {output_path.name}[/yellow]"
+        )
+        queued = SCREENSHOTS_SUBDIR / output_path.name
+        for step in reversed(self.steps):
+            if step.screenshot_path == queued:
+                step.screenshot_path = SCREENSHOTS_SUBDIR / saved_path.name
+                break
 
     # -------------------------------------------------------------------------
     # Description Generation
@@ -561,11 +955,12 @@ class Recorder:
 
         identifier = text or el_id or placeholder or tag
 
-        if action_type == "click":
-            return f"Click on '{identifier}'"
-        elif action_type == "dblclick":
-            return f"Double-click on '{identifier}'"
-        elif action_type == "input":
+        # Actions described by the element alone
+        template = _DESCRIPTION_TEMPLATES.get(action_type)
+        if template is not None:
+            return template.format(identifier=identifier)
+
+        if action_type == "input":
             value = data.get("value", "")
             if len(value) > 20:
                 return f"Type '{value[:20]}...' in {identifier}"
@@ -573,34 +968,22 @@ class Recorder:
         elif action_type == "select":
             selected = data.get("selectedText", data.get("value", ""))
             return f"Select '{selected}' in {identifier}"
-        elif action_type == "check":
-            return f"Check {identifier}"
-        elif action_type == "uncheck":
-            return f"Uncheck {identifier}"
         elif action_type == "keypress":
             key = data.get("key", "")
             return f"Press {key}"
         else:
             return f"{action_type} on {identifier}"
 
-    def _generate_detailed_description(
-        self,
-        action_type: ActionType,
-        element: ElementInfo,
-        data: dict[str, Any],
-    ) -> str:
-        """Generate a detailed description for the step."""
-        short = self._generate_short_description(action_type, element, data)
-        selector = element.selector
-
-        return f"{short}\nElement: {selector}"
+    def _generate_detailed_description(self, description_short: str, element: ElementInfo) -> str:
+        """Generate a detailed description for the step from its short one."""
+        return f"{description_short}\nElement: {element.selector}"
 
     # -------------------------------------------------------------------------
     # Export
     # -------------------------------------------------------------------------
 
     async def _export_testcase(self) -> None:
-        """Export the recorded test case to all formats."""
+        """Export the recorded test case to the configured formats."""
         if not self.steps:
             console.print("[yellow]No steps recorded. Nothing to export.[/yellow]")
             return
@@ -632,22 +1015,24 @@ class Recorder:
             total_steps=len(self.steps),
         )
 
-        # Export to all formats
-        console.print("\n[bold]Exporting test case...[/bold]")
-
-        # JSON
-        json_exporter = JSONExporter()
-        json_path = json_exporter.export(testcase, self.output_dir)
-        console.print(f"  [green]✓[/green] JSON: {json_path}")
+        # Exporters (and Jinja2) load only when their format is requested
+        from testcaseer import exporters
 
-        # Markdown
-        md_exporter = MarkdownExporter()
-        md_path = md_exporter.export(testcase, self.output_dir)
-        console.print(f"  [green]✓[/green] Markdown: {md_path}")
+        console.print("\n[bold]Exporting test case...[/bold]")
 
-        # HTML
-        html_exporter = HTMLExporter()
-        html_path = html_exporter.export(testcase, self.output_dir)
-        console.print(f"  [green]✓[/green] HTML: {html_path}")
+        # Each exporter only reads the test case, so they run side by side in
+        # threads; the HTML one spends most of its time reading screenshots
+        paths = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    getattr(exporters, EXPORT_FORMATS[fmt][1])().export,
+                    testcase,
+                    self.output_dir,
+                )
+                for fmt in self.formats
+            )
+        )
+        for fmt, path in zip(self.formats, paths, strict=True):
+            console.print(f"  [green]✓[/green] {EXPORT_FORMATS[fmt][0]}: {path}")
 
         console.print(f"\n[bold green]✓ Test case saved to {self.output_dir}[/bold green]")
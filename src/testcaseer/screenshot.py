@@ -1,9 +1,85 @@
 """Screenshot capture and annotation for TestCaseer."""
 
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import re
+from collections.abc import Mapping
+from io import BytesIO
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from PIL import Image, ImageDraw
-from playwright.async_api import Page
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+# Lossy WebP is a fraction of the PNG size and still sharp for UI screenshots
+SCREENSHOT_FORMAT = "WEBP"
+SCREENSHOT_EXTENSION = "webp"
+SCREENSHOT_QUALITY = 80
+
+# Anything but letters, digits and hyphens (\w also matches "_", which is replaced)
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w-]|_")
+
+
+async def capture_screenshot(page: Page) -> bytes:
+    """
+    Capture the visible part of the page.
+
+    Only talks to the browser; writing and highlighting the image is left to
+    ``save_screenshot`` so it can run off the event loop.
+
+    Args:
+        page: Playwright Page object
+
+    Returns:
+        PNG bytes of the viewport
+    """
+    return await page.screenshot(full_page=False)
+
+
+def save_screenshot(
+    data: bytes,
+    output_path: Path,
+    box: Mapping[str, float] | None = None,
+) -> Path:
+    """
+    Write a captured screenshot to disk, highlighting the element if given.
+
+    The image is encoded in ``SCREENSHOT_FORMAT``. If Pillow cannot decode
+    or re-encode it (e.g. built without WebP support), the capture is kept
+    as is in a ``.png`` file next to ``output_path`` instead, so the
+    extension still matches the content. Blocking; call it from a worker
+    thread when on the event loop.
+
+    Args:
+        data: PNG bytes from ``capture_screenshot``
+        output_path: Path to save the screenshot
+        box: Bounding box to highlight (optional)
+
+    Returns:
+        Path to the saved screenshot; differs from ``output_path`` when the
+        PNG fallback was written
+    """
+    # Ensure parent directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        # Decode once, draw in memory and encode once in the target format
+        with Image.open(BytesIO(data)) as img:
+            if box:
+                _draw_highlight(img, box)
+            img.save(output_path, SCREENSHOT_FORMAT, quality=SCREENSHOT_QUALITY, method=4)
+    except (OSError, KeyError, ValueError):
+        # Unreadable image or missing encoder: keep the capture unannotated
+        output_path.unlink(missing_ok=True)
+        fallback_path = output_path.with_suffix(".png")
+        fallback_path.write_bytes(data)
+        return fallback_path
+
+    return output_path
 
 
 async def take_screenshot(
@@ -22,58 +98,59 @@ async def take_screenshot(
     Returns:
         Path to the saved screenshot
     """
-    # Ensure parent directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Take screenshot
-    await page.screenshot(path=output_path, full_page=False)
+    data = await capture_screenshot(page)
 
-    # Add highlight if selector provided
+    box: dict[str, float] | None = None
     if highlight_selector:
-        try:
+        # If the element cannot be located, the screenshot is kept as is
+        with contextlib.suppress(Exception):
             element = await page.query_selector(highlight_selector)
             if element:
-                box = await element.bounding_box()
-                if box:
-                    # Convert FloatRect to dict
-                    box_dict = {
-                        "x": box["x"],
-                        "y": box["y"],
-                        "width": box["width"],
-                        "height": box["height"],
+                rect = await element.bounding_box()
+                if rect:
+                    box = {
+                        "x": rect["x"],
+                        "y": rect["y"],
+                        "width": rect["width"],
+                        "height": rect["height"],
                     }
-                    add_highlight_box(output_path, box_dict)
-        except Exception:
-            # If highlighting fails, just return the original screenshot
-            pass
 
-    return output_path
+    return await asyncio.to_thread(save_screenshot, data, output_path, box)
 
 
-def add_highlight_box(image_path: Path, box: dict[str, float]) -> None:
+def add_highlight_box(image_path: Path, box: Mapping[str, float]) -> None:
     """
-    Add a red highlight box around an element in the screenshot.
+    Add a red highlight box around an element in a saved screenshot.
 
     Args:
         image_path: Path to the image file
         box: Bounding box with x, y, width, height
     """
-    img = Image.open(image_path)
-    draw = ImageDraw.Draw(img)
+    with Image.open(image_path) as img:
+        img.load()
+        _draw_highlight(img, box)
+        img.save(image_path)
+
+
+def _draw_highlight(img: Image.Image, box: Mapping[str, float]) -> None:
+    """
+    Draw the red highlight box onto an image in memory.
 
+    Args:
+        img: Screenshot image
+        box: Bounding box with x, y, width, height
+    """
     x = box["x"]
     y = box["y"]
     w = box["width"]
     h = box["height"]
 
-    # Draw red rectangle with 3px border
-    for i in range(3):
-        draw.rectangle(
-            [x - i, y - i, x + w + i, y + h + i],
-            outline="red",
-        )
+    # Hidden or collapsed elements have nothing to outline
+    if w <= 0 or h <= 0:
+        return
 
-    img.save(image_path)
+    # Red 3px border just outside the element; PIL strokes inward from the bounds
+    ImageDraw.Draw(img).rectangle([x - 2, y - 2, x + w + 2, y + h + 2], outline="red", width=3)
 
 
 def generate_screenshot_filename(
@@ -90,13 +167,12 @@ def generate_screenshot_filename(
         element_id: Optional element identifier
 
     Returns:
-        Filename like "001_click_login-button.png"
+        Filename like "001_click_login-button.webp"
     """
     # Sanitize element_id for filename
     if element_id:
-        # Remove special characters, keep alphanumeric and hyphens
-        safe_id = "".join(c if c.isalnum() or c == "-" else "-" for c in element_id)
-        safe_id = safe_id[:30]  # Limit length
-        return f"{step_number:03d}_{action_type}_{safe_id}.png"
+        # Replace special characters, keep alphanumeric and hyphens; limit length
+        safe_id = _UNSAFE_FILENAME_CHARS.sub("-", element_id[:30])
+        return f"{step_number:03d}_{action_type}_{safe_id}.{SCREENSHOT_EXTENSION}"
 
-    return f"{step_number:03d}_{action_type}.png"
+    return f"{step_number:03d}_{action_type}.{SCREENSHOT_EXTENSION}"
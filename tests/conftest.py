@@ -1,9 +1,11 @@
 """Pytest configuration and fixtures for TestCaseer tests."""
 
-import tempfile
+import itertools
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
-from typing import Generator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -16,28 +18,61 @@ from testcaseer.models import (
     TestCase,
 )
 
+# Minimal 1x1 red PNG image
+_SAMPLE_PNG = bytes.fromhex(
+    "89504E470D0A1A0A"  # PNG signature
+    "0000000D4948445200000001000000010802000000907753DE"  # IHDR chunk
+    "0000000C4944415408D763F8FFFF3F0005FE02FEDCCC59E7"  # IDAT chunk
+    "0000000049454E44AE426082"  # IEND chunk
+)
+
 
 # -----------------------------------------------------------------------------
 # Pytest markers configuration
 # -----------------------------------------------------------------------------
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add options for opting in to slow tests."""
+    parser.addoption("--run-slow", action="store_true", help="also run tests marked slow")
+
+
 def pytest_configure(config: pytest.Config) -> None:
     """Register custom markers."""
-    config.addinivalue_line("markers", "slow: marks tests as slow (deselect with '-m \"not slow\"')")
+    config.addinivalue_line("markers", "slow: marks tests as slow (run them with --run-slow)")
     config.addinivalue_line("markers", "integration: marks tests as integration tests")
 
 
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip slow tests unless --run-slow is given."""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test, use --run-slow to run it")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
 # -----------------------------------------------------------------------------
 # Path fixtures
 # -----------------------------------------------------------------------------
 
 
+_temp_dir_counter = itertools.count()
+
+
+@pytest.fixture(scope="session")
+def temp_base_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create one base directory per session; pytest handles its cleanup."""
+    return tmp_path_factory.mktemp("testcaseer")
+
+
 @pytest.fixture
-def temp_dir() -> Generator[Path, None, None]:
-    """Create a temporary directory for test outputs."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+def temp_dir(temp_base_dir: Path) -> Path:
+    """Create a fresh, empty subdirectory for test outputs."""
+    path = temp_base_dir / f"t{next(_temp_dir_counter)}"
+    path.mkdir()
+    return path
 
 
 @pytest.fixture
@@ -50,10 +85,13 @@ def screenshots_dir(temp_dir: Path) -> Path:
 
 # -----------------------------------------------------------------------------
 # Model fixtures
+#
+# Built once per session and shared: tests must not mutate them. Use
+# make_testcase() or model_copy() to get a variant.
 # -----------------------------------------------------------------------------
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_element_info() -> ElementInfo:
     """Create a sample ElementInfo object."""
     return ElementInfo(
@@ -67,7 +105,7 @@ def sample_element_info() -> ElementInfo:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_network_request() -> NetworkRequest:
     """Create a sample NetworkRequest object."""
     return NetworkRequest(
@@ -85,7 +123,7 @@ def sample_network_request() -> NetworkRequest:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_console_log() -> ConsoleLog:
     """Create a sample ConsoleLog object."""
     return ConsoleLog(
@@ -97,7 +135,7 @@ def sample_console_log() -> ConsoleLog:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_page_error() -> PageError:
     """Create a sample PageError object."""
     return PageError(
@@ -107,7 +145,7 @@ def sample_page_error() -> PageError:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_step(sample_element_info: ElementInfo) -> Step:
     """Create a sample Step object."""
     return Step(
@@ -127,7 +165,7 @@ def sample_step(sample_element_info: ElementInfo) -> Step:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_step_with_input(sample_element_info: ElementInfo) -> Step:
     """Create a sample Step with input action."""
     element = ElementInfo(
@@ -156,7 +194,7 @@ def sample_step_with_input(sample_element_info: ElementInfo) -> Step:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_testcase(
     sample_step: Step,
     sample_step_with_input: Step,
@@ -182,24 +220,48 @@ def sample_testcase(
     )
 
 
-@pytest.fixture
-def sample_testcase_minimal() -> TestCase:
+@pytest.fixture(scope="session")
+def sample_testcase_json(sample_testcase: TestCase) -> str:
+    """Serialize the sample TestCase to JSON once per session."""
+    return sample_testcase.model_dump_json()
+
+
+@pytest.fixture(scope="session")
+def sample_testcase_dump(sample_testcase: TestCase) -> dict[str, Any]:
+    """Dump the sample TestCase to a dict once per session."""
+    return sample_testcase.model_dump()
+
+
+@pytest.fixture(scope="session")
+def make_testcase() -> Callable[..., TestCase]:
+    """Return a factory for minimal TestCase objects with optional field overrides."""
+
+    def make(**overrides: Any) -> TestCase:
+        fields: dict[str, Any] = {
+            "id": "tc_minimal",
+            "name": "Minimal Test",
+            "created_at": datetime(2025, 1, 1, 12, 0, 0),
+            "start_url": "https://example.com",
+            "browser": "chromium",
+            "viewport": {"width": 1280, "height": 720},
+            "user_agent": "TestAgent/1.0",
+            "steps": [],
+            "console_logs": [],
+            "network_requests": [],
+            "page_errors": [],
+            "total_duration": 0.0,
+            "total_steps": 0,
+        }
+        fields.update(overrides)
+        return TestCase(**fields)
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def sample_testcase_minimal(make_testcase: Callable[..., TestCase]) -> TestCase:
     """Create a minimal TestCase for basic tests."""
-    return TestCase(
-        id="tc_minimal",
-        name="Minimal Test",
-        created_at=datetime(2025, 1, 1, 12, 0, 0),
-        start_url="https://example.com",
-        browser="chromium",
-        viewport={"width": 1280, "height": 720},
-        user_agent="TestAgent/1.0",
-        steps=[],
-        console_logs=[],
-        network_requests=[],
-        page_errors=[],
-        total_duration=0.0,
-        total_steps=0,
-    )
+    return make_testcase()
 
 
 # -----------------------------------------------------------------------------
@@ -207,27 +269,36 @@ def sample_testcase_minimal() -> TestCase:
 # -----------------------------------------------------------------------------
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_screenshot_bytes() -> bytes:
-    """Create minimal valid PNG bytes for testing."""
-    # Minimal 1x1 red PNG image
-    return bytes([
-        0x89, 0x50, 0x4E, 0x47, 0x0D, 0x0A, 0x1A, 0x0A,  # PNG signature
-        0x00, 0x00, 0x00, 0x0D, 0x49, 0x48, 0x44, 0x52,  # IHDR chunk
-        0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x01,  # 1x1 pixels
-        0x08, 0x02, 0x00, 0x00, 0x00, 0x90, 0x77, 0x53,  # RGB, etc
-        0xDE, 0x00, 0x00, 0x00, 0x0C, 0x49, 0x44, 0x41,  # IDAT chunk
-        0x54, 0x08, 0xD7, 0x63, 0xF8, 0xFF, 0xFF, 0x3F,  # Compressed data
-        0x00, 0x05, 0xFE, 0x02, 0xFE, 0xDC, 0xCC, 0x59,
-        0xE7, 0x00, 0x00, 0x00, 0x00, 0x49, 0x45, 0x4E,  # IEND chunk
-        0x44, 0xAE, 0x42, 0x60, 0x82,
-    ])
+    """Return minimal valid PNG bytes for testing (immutable, shared per session)."""
+    return _SAMPLE_PNG
 
 
-@pytest.fixture
-def sample_screenshot_file(temp_dir: Path, sample_screenshot_bytes: bytes) -> Path:
-    """Create a sample screenshot file."""
-    screenshot_path = temp_dir / "test_screenshot.png"
+@pytest.fixture(scope="session")
+def sample_screenshot_file(temp_base_dir: Path, sample_screenshot_bytes: bytes) -> Path:
+    """Create a sample screenshot file once per session (read-only)."""
+    screenshot_path = temp_base_dir / "test_screenshot.png"
     screenshot_path.write_bytes(sample_screenshot_bytes)
     return screenshot_path
 
+
+# -----------------------------------------------------------------------------
+# Mock fixtures
+# -----------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def browser_mock_factory() -> Callable[[], MagicMock]:
+    """Return a factory for pre-configured BrowserManager mocks."""
+
+    def make() -> MagicMock:
+        browser = MagicMock()
+        browser.page = MagicMock()
+        browser.page.url = "https://example.com"
+        browser.page.title = AsyncMock(return_value="Example")
+        browser.user_agent = "TestAgent/1.0"
+        browser.viewport = {"width": 1920, "height": 1080}
+        return browser
+
+    return make
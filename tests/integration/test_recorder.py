@@ -1,13 +1,28 @@
 """Integration tests for the Recorder."""
 
-from datetime import datetime
+import asyncio
+import os
+from collections.abc import Callable
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from testcaseer.models import TestCase
-from testcaseer.recorder import Recorder
+from testcaseer.exporters import BaseExporter, HTMLExporter, JSONExporter, MarkdownExporter
+from testcaseer.models import ActionType, ElementInfo, NetworkRequest, Step, TestCase
+from testcaseer.recorder import Recorder, _capture_api_name_only, _disable_playwright_stack_capture
+
+
+@pytest.fixture(scope="module")
+def default_recorder(tmp_path_factory: pytest.TempPathFactory) -> Recorder:
+    """Build one default Recorder shared by read-only state checks."""
+    return Recorder(start_url="https://example.com", output_dir=tmp_path_factory.mktemp("rec"))
+
+
+@pytest.fixture
+def recorder(temp_dir: Path) -> Recorder:
+    """Create a default Recorder writing to this test's temp_dir."""
+    return Recorder(start_url="https://example.com", output_dir=temp_dir)
 
 
 @pytest.mark.integration
@@ -27,15 +42,6 @@ class TestRecorderInit:
         assert recorder.output_dir == temp_dir.resolve()
         assert recorder.browser_type == "chromium"
 
-    def test_recorder_default_browser(self, temp_dir: Path) -> None:
-        """Test Recorder with default browser."""
-        recorder = Recorder(
-            start_url="https://example.com",
-            output_dir=temp_dir,
-        )
-        
-        assert recorder.browser_type == "chromium"
-
     def test_recorder_creates_output_dir(self, temp_dir: Path) -> None:
         """Test that Recorder stores output directory."""
         output_path = temp_dir / "new_output"
@@ -53,25 +59,23 @@ class TestRecorderInit:
 class TestRecorderState:
     """Tests for Recorder state management."""
 
-    def test_recorder_initial_state(self, temp_dir: Path) -> None:
-        """Test Recorder initial state."""
-        recorder = Recorder(
-            start_url="https://example.com",
-            output_dir=temp_dir,
-        )
-        
-        assert recorder.is_recording is False
-        assert len(recorder.steps) == 0
-
-    def test_recorder_steps_list(self, temp_dir: Path) -> None:
-        """Test that recorder has empty steps list."""
-        recorder = Recorder(
-            start_url="https://example.com",
-            output_dir=temp_dir,
-        )
-        
-        assert isinstance(recorder.steps, list)
-        assert len(recorder.steps) == 0
+    @pytest.mark.parametrize(
+        ("attr", "check"),
+        [
+            ("steps", lambda v: isinstance(v, list) and not v),
+            ("console_logs", lambda v: isinstance(v, list) and not v),
+            ("network_requests", lambda v: isinstance(v, list) and not v),
+            ("page_errors", lambda v: isinstance(v, list) and not v),
+            ("is_recording", lambda v: v is False),
+            ("browser_type", lambda v: v == "chromium"),
+        ],
+        ids=["steps", "console_logs", "network_requests", "page_errors", "is_recording", "browser_type"],
+    )
+    def test_recorder_defaults(
+        self, default_recorder: Recorder, attr: str, check: Callable[[object], bool]
+    ) -> None:
+        """Test the initial state of a Recorder built with default arguments."""
+        assert check(getattr(default_recorder, attr))
 
 
 @pytest.mark.integration
@@ -80,144 +84,523 @@ class TestRecorderWithMocks:
     """Tests for Recorder with mocked browser."""
 
     @pytest.mark.asyncio
-    async def test_start_recording(self, temp_dir: Path) -> None:
+    async def test_start_recording(
+        self, recorder: Recorder, browser_mock_factory: Callable[[], MagicMock]
+    ) -> None:
         """Test starting recording."""
-        recorder = Recorder(
-            start_url="https://example.com",
-            output_dir=temp_dir,
-        )
-        
-        with patch.object(recorder, "_browser_manager") as mock_browser:
-            mock_browser.page = MagicMock()
-            
-            recorder.start_recording()
-            
-            assert recorder.is_recording is True
+        recorder._browser_manager = browser_mock_factory()
+
+        await recorder.start_recording()
+
+        assert recorder.is_recording is True
 
     @pytest.mark.asyncio
-    async def test_stop_recording(self, temp_dir: Path) -> None:
+    async def test_stop_recording(
+        self, recorder: Recorder, browser_mock_factory: Callable[[], MagicMock]
+    ) -> None:
         """Test stopping recording."""
-        recorder = Recorder(
-            start_url="https://example.com",
-            output_dir=temp_dir,
-        )
-        
-        with patch.object(recorder, "_browser_manager") as mock_browser:
-            mock_browser.page = MagicMock()
-            
-            recorder.start_recording()
-            assert recorder.is_recording is True
-            
-            recorder.stop_recording()
-            assert recorder.is_recording is False
+        recorder._browser_manager = browser_mock_factory()
+
+        await recorder.start_recording()
+        assert recorder.is_recording is True
+
+        await recorder.stop_recording()
+        assert recorder.is_recording is False
 
     @pytest.mark.asyncio
-    async def test_recording_creates_steps(self, temp_dir: Path) -> None:
+    async def test_recording_creates_steps(
+        self, recorder: Recorder, browser_mock_factory: Callable[[], MagicMock]
+    ) -> None:
         """Test that recording can add steps."""
-        recorder = Recorder(
-            start_url="https://example.com",
-            output_dir=temp_dir,
-        )
-        
-        with patch.object(recorder, "_browser_manager") as mock_browser:
-            mock_page = MagicMock()
-            mock_page.url = "https://example.com"
-            mock_page.title = AsyncMock(return_value="Example")
-            mock_browser.page = mock_page
-            mock_browser.user_agent = "TestAgent/1.0"
-            mock_browser.viewport = {"width": 1920, "height": 1080}
-            
-            recorder.start_recording()
-            # Steps list should exist
-            assert isinstance(recorder.steps, list)
-            
-            recorder.stop_recording()
+        recorder._browser_manager = browser_mock_factory()
+
+        await recorder.start_recording()
+        # Steps list should exist
+        assert isinstance(recorder.steps, list)
+
+        await recorder.stop_recording()
 
 
 @pytest.mark.integration
 class TestRecorderEventHandling:
     """Tests for Recorder event handling."""
 
-    def test_recorder_has_steps_list(self, temp_dir: Path) -> None:
-        """Test that recorder has steps list."""
+    @pytest.mark.parametrize(("capture", "expected"), [(False, []), (True, ["42"])])
+    def test_console_args_opt_in(self, temp_dir: Path, capture: bool, expected: list[str]) -> None:
+        """Test that console arguments are only stored when asked for."""
         recorder = Recorder(
-            start_url="https://example.com",
-            output_dir=temp_dir,
+            start_url="https://example.com", output_dir=temp_dir, capture_console_args=capture
         )
-        
-        assert hasattr(recorder, "steps")
-        assert isinstance(recorder.steps, list)
+        message = MagicMock()
+        message.type = "log"
+        message.text = "answer 42"
+        message.location = None
+        message.args = ["42"]
 
-    def test_console_logs_captured(self, temp_dir: Path) -> None:
-        """Test that console logs are captured."""
-        recorder = Recorder(
-            start_url="https://example.com",
-            output_dir=temp_dir,
+        recorder._on_console_message(message)
+
+        assert recorder.console_logs[0].args == expected
+
+
+    @pytest.mark.parametrize(
+        ("action_type", "data", "expected"),
+        [
+            ("click", {}, "Click on 'Submit'"),
+            ("dblclick", {}, "Double-click on 'Submit'"),
+            ("check", {}, "Check Submit"),
+            ("input", {"value": "x" * 25}, f"Type '{'x' * 20}...' in Submit"),
+            ("select", {"value": "ru", "selectedText": "Russian"}, "Select 'Russian' in Submit"),
+            ("keypress", {"key": "Enter"}, "Press Enter"),
+        ],
+    )
+    def test_step_descriptions(
+        self,
+        recorder: Recorder,
+        sample_element_info: ElementInfo,
+        action_type: ActionType,
+        data: dict,
+        expected: str,
+    ) -> None:
+        """Test short and detailed step descriptions for each action type."""
+        short = recorder._generate_short_description(action_type, sample_element_info, data)
+        detailed = recorder._generate_detailed_description(short, sample_element_info)
+
+        assert short == expected
+        assert detailed == f"{expected}\nElement: button#submit"
+
+
+    @pytest.mark.asyncio
+    async def test_event_lines_are_batched(self, recorder: Recorder) -> None:
+        """Test that a burst of event lines is printed in one write."""
+        recorder.EVENT_LOG_INTERVAL = 0.01
+
+        with patch("testcaseer.recorder.console") as mock_console:
+            for i in range(3):
+                recorder._log_event(f"line {i}")
+            mock_console.print.assert_not_called()
+
+            await asyncio.sleep(0.05)
+
+        mock_console.print.assert_called_once_with("line 0\nline 1\nline 2")
+
+
+@pytest.mark.integration
+class TestRecorderInputCoalescing:
+    """Tests for coalescing input events into one step per field."""
+
+    @pytest.fixture
+    def recorder(self, recorder: Recorder) -> Recorder:
+        """Create a recording Recorder whose step creation is mocked."""
+        recorder.is_recording = True
+        recorder.INPUT_IDLE_DELAY = 0.02
+        recorder.INPUT_MAX_DELAY = 0.1
+        recorder._create_step = AsyncMock()  # type: ignore[method-assign]
+        return recorder
+
+    @staticmethod
+    def recorded(recorder: Recorder) -> list[tuple[str, str | None]]:
+        """Get (eventType, value) of every recorded action."""
+        return [
+            (call.args[0]["eventType"], call.args[0].get("value"))
+            for call in recorder._create_step.call_args_list  # type: ignore[attr-defined]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_burst_records_latest_value(self, recorder: Recorder) -> None:
+        """Test that typing in one field becomes a single step."""
+        for value in ("a", "ab", "abc"):
+            await recorder.on_action({"eventType": "input", "selector": "#q", "value": value})
+        await asyncio.sleep(0.05)
+
+        assert self.recorded(recorder) == [("input", "abc")]
+
+    @pytest.mark.asyncio
+    async def test_other_action_flushes_input_first(self, recorder: Recorder) -> None:
+        """Test that a click after typing is recorded after the input."""
+        await recorder.on_action({"eventType": "input", "selector": "#q", "value": "x"})
+        await recorder.on_action({"eventType": "click", "selector": "#go"})
+
+        assert self.recorded(recorder) == [("input", "x"), ("click", None)]
+
+    @pytest.mark.asyncio
+    async def test_continuous_typing_flushes_after_max_delay(self, recorder: Recorder) -> None:
+        """Test that a field that never goes idle is still recorded."""
+        for i in range(12):
+            await recorder.on_action({"eventType": "input", "selector": "#q", "value": str(i)})
+            await asyncio.sleep(0.015)
+
+        assert len(self.recorded(recorder)) >= 1
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_input(self, recorder: Recorder) -> None:
+        """Test that text typed right before Stop is not lost."""
+        recorder._export_testcase = AsyncMock()  # type: ignore[method-assign]
+        await recorder.on_action({"eventType": "input", "selector": "#q", "value": "last"})
+        await recorder.stop_recording()
+
+        assert self.recorded(recorder) == [("input", "last")]
+
+
+@pytest.mark.integration
+class TestRecorderNetworkTracking:
+    """Tests for matching network responses to their requests."""
+
+    @pytest.fixture
+    def recorder(self, recorder: Recorder) -> Recorder:
+        """Create a Recorder that is recording."""
+        recorder.is_recording = True
+        return recorder
+
+    @staticmethod
+    def make_request(url: str) -> MagicMock:
+        """Create a mock Playwright request for a stylesheet."""
+        request = MagicMock()
+        request.url = url
+        request.method = "GET"
+        request.resource_type = "stylesheet"
+        request.headers = {}
+        request.timing = None
+        return request
+
+    @staticmethod
+    def make_response(request: MagicMock, status: int) -> MagicMock:
+        """Create a mock Playwright response to the given request."""
+        response = MagicMock()
+        response.url = request.url
+        response.request = request
+        response.status = status
+        response.headers = {}
+        return response
+
+    def test_same_url_requests_are_matched_separately(self, recorder: Recorder) -> None:
+        """Test that concurrent requests to one URL each get their own response."""
+        first = self.make_request("https://example.com/app.css")
+        second = self.make_request("https://example.com/app.css")
+        recorder._on_request(first)
+        recorder._on_request(second)
+
+        recorder._on_response(self.make_response(second, 304))
+        recorder._on_response(self.make_response(first, 200))
+
+        assert [r.status for r in recorder.network_requests] == [304, 200]
+        assert not recorder._pending_requests
+
+    def test_events_ignored_while_not_recording(self, recorder: Recorder) -> None:
+        """Test that the dispatcher only forwards events during recording."""
+        handler = MagicMock()
+
+        recorder.is_recording = False
+        recorder._dispatch_page_event(handler, "idle")
+        recorder.is_recording = True
+        recorder._dispatch_page_event(handler, "recording")
+
+        handler.assert_called_once_with("recording")
+
+    @pytest.mark.asyncio
+    async def test_large_declared_body_is_not_fetched(self, recorder: Recorder) -> None:
+        """Test that an oversized Content-Length skips downloading the body."""
+        response = MagicMock()
+        response.body = AsyncMock(return_value=b"{}")
+        response.headers = {"content-length": str(10 * 1024 * 1024)}
+        net_request = NetworkRequest(
+            method="GET", url="https://example.com/api/export", resource_type="fetch"
         )
-        
-        assert hasattr(recorder, "console_logs")
-        assert isinstance(recorder.console_logs, list)
 
-    def test_network_requests_captured(self, temp_dir: Path) -> None:
-        """Test that network requests are captured."""
-        recorder = Recorder(
-            start_url="https://example.com",
-            output_dir=temp_dir,
+        await recorder._capture_response_body(response, net_request)
+
+        response.body.assert_not_called()
+        assert net_request.response_body == f"[Large response, {10 * 1024 * 1024} bytes]"
+        assert recorder.network_requests == [net_request]
+
+    @pytest.mark.asyncio
+    async def test_small_body_is_captured(self, recorder: Recorder) -> None:
+        """Test that a response without Content-Length is still read."""
+        response = MagicMock()
+        response.body = AsyncMock(return_value=b'{"ok": true}')
+        response.headers = {}
+        net_request = NetworkRequest(
+            method="GET", url="https://example.com/api", resource_type="xhr"
         )
-        
-        assert hasattr(recorder, "network_requests")
-        assert isinstance(recorder.network_requests, list)
 
-    def test_page_errors_captured(self, temp_dir: Path) -> None:
-        """Test that page errors are captured."""
+        await recorder._capture_response_body(response, net_request)
+
+        assert net_request.response_body == '{"ok": true}'
+
+    def test_header_allowlist(self, temp_dir: Path) -> None:
+        """Test that only allowlisted headers are kept when an allowlist is set."""
         recorder = Recorder(
             start_url="https://example.com",
             output_dir=temp_dir,
+            header_allowlist={"Content-Type"},
         )
-        
-        assert hasattr(recorder, "page_errors")
-        assert isinstance(recorder.page_errors, list)
+        recorder.is_recording = True
+        request = self.make_request("https://example.com/api")
+        request.headers = {"content-type": "application/json", "cookie": "secret"}
+        recorder._on_request(request)
+
+        response = self.make_response(request, 200)
+        response.headers = {"content-type": "text/plain", "set-cookie": "id=1"}
+        recorder._on_response(response)
+
+        net_request = recorder.network_requests[0]
+        assert net_request.request_headers == {"content-type": "application/json"}
+        assert net_request.response_headers == {"content-type": "text/plain"}
+
+    @pytest.mark.asyncio
+    async def test_xhr_bodies_read_in_order(self, recorder: Recorder) -> None:
+        """Test that XHR responses are completed by one worker, in arrival order."""
+        requests = [self.make_request(f"https://example.com/api/{i}") for i in range(3)]
+        for request in requests:
+            request.resource_type = "xhr"
+            recorder._on_request(request)
+        for request in requests:
+            response = self.make_response(request, 200)
+            response.body = AsyncMock(return_value=request.url.encode())
+            recorder._on_response(response)
+
+        await recorder._body_queue.join()
+
+        assert [r.response_body for r in recorder.network_requests] == [r.url for r in requests]
+        recorder._body_worker.cancel()  # type: ignore[union-attr]
+
+    @pytest.mark.parametrize(
+        "url", ["data:image/png;base64,AAAA", "https://example.com/__testcaseer/ping"]
+    )
+    def test_internal_requests_are_skipped(self, recorder: Recorder, url: str) -> None:
+        """Test that data URLs and internal requests are not tracked."""
+        recorder._on_request(self.make_request(url))
+
+        assert not recorder._pending_requests
+
+    def test_pending_requests_are_bounded(self, recorder: Recorder) -> None:
+        """Test that requests which never complete are dropped oldest first."""
+        recorder.MAX_PENDING_REQUESTS = 2
+        requests = [self.make_request(f"https://example.com/{i}.css") for i in range(3)]
+        for request in requests:
+            recorder._on_request(request)
+
+        recorder._on_response(self.make_response(requests[0], 200))
+
+        assert len(recorder._pending_requests) == 2
+        assert recorder.network_requests == []
+
+
+@pytest.mark.integration
+class TestRecorderStartup:
+    """Tests for failures while the session starts."""
+
+    @pytest.mark.asyncio
+    async def test_prepare_error_cancels_launch(self, recorder: Recorder) -> None:
+        """Test that an output-dir error surfaces as is and stops the browser launch."""
+        launch_cancelled = asyncio.Event()
+
+        async def start() -> None:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                launch_cancelled.set()
+                raise
+
+        with (
+            patch("testcaseer.recorder.BrowserManager") as manager_cls,
+            patch.object(recorder, "_prepare_session", side_effect=OSError("read-only")),
+            pytest.raises(OSError, match="read-only"),
+        ):
+            manager_cls.return_value.start = start
+            manager_cls.return_value.close = AsyncMock()
+            await recorder.run()
+
+        assert launch_cancelled.is_set()
+        manager_cls.return_value.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_prints_title_once_dom_is_loaded(self, recorder: Recorder) -> None:
+        """Test that the page title is read after the DOM loads, not at navigation commit."""
+        page = MagicMock()
+        loaded = False
+
+        async def wait_for_load_state(state: str) -> None:
+            nonlocal loaded
+            loaded = state == "domcontentloaded"
+
+        async def title() -> str:
+            return "Example" if loaded else ""
+
+        page.wait_for_load_state = wait_for_load_state
+        page.title = title
+        recorder._recording_complete.set()
+
+        with (
+            patch("testcaseer.recorder.BrowserManager") as manager_cls,
+            patch("testcaseer.recorder.inject_control_panel", AsyncMock(return_value=None)),
+            patch("testcaseer.recorder.setup_event_listeners", AsyncMock()),
+            patch("testcaseer.recorder.console") as console,
+        ):
+            manager_cls.return_value.start = AsyncMock(return_value=page)
+            manager_cls.return_value.navigate = AsyncMock()
+            manager_cls.return_value.close = AsyncMock()
+            await recorder.run()
+
+        printed = [c.args[0] for c in console.print.call_args_list if c.args]
+        assert "[green]✓[/green] Page loaded: Example" in printed
+
+    @pytest.mark.asyncio
+    async def test_launch_error_keeps_its_type(self, recorder: Recorder) -> None:
+        """Test that a failed browser launch is not wrapped in an ExceptionGroup."""
+        with (
+            patch("testcaseer.recorder.BrowserManager") as manager_cls,
+            pytest.raises(RuntimeError, match="not installed"),
+        ):
+            manager_cls.return_value.start = AsyncMock(side_effect=RuntimeError("not installed"))
+            manager_cls.return_value.close = AsyncMock()
+            await recorder.run()
+
+
+@pytest.mark.integration
+class TestRecorderScreenshotQueue:
+    """Tests for writing screenshots in the background."""
+
+    @pytest.mark.asyncio
+    async def test_queued_screenshots_are_written(
+        self, recorder: Recorder, sample_screenshot_bytes: bytes
+    ) -> None:
+        """Test that the background writer saves every queued screenshot."""
+        paths = [recorder.screenshots_dir / f"00{i}_click.webp" for i in (1, 2)]
+
+        for path in paths:
+            recorder._queue_screenshot(sample_screenshot_bytes, path)
+        await recorder._screenshot_queue.join()
+
+        assert all(path.stat().st_size > 0 for path in paths)
+        recorder._screenshot_worker.cancel()  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio
+    async def test_png_fallback_updates_step(
+        self, recorder: Recorder, sample_step: Step, sample_screenshot_bytes: bytes
+    ) -> None:
+        """Test that a screenshot saved as PNG fallback is what the step points to."""
+        path = recorder.screenshots_dir / "001_click.webp"
+        recorder.steps.append(
+            sample_step.model_copy(update={"screenshot_path": Path("screenshots/001_click.webp")})
+        )
+
+        with patch("testcaseer.recorder.save_screenshot", return_value=path.with_suffix(".png")):
+            recorder._queue_screenshot(sample_screenshot_bytes, path)
+            await recorder._screenshot_queue.join()
+
+        assert recorder.steps[0].screenshot_path == Path("screenshots/001_click.png")
+        recorder._screenshot_worker.cancel()  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio
+    async def test_queued_box_is_highlighted(
+        self, recorder: Recorder, sample_screenshot_bytes: bytes
+    ) -> None:
+        """Test that the element box queued with a screenshot is passed to the writer."""
+        path = recorder.screenshots_dir / "001_click.webp"
+        box = {"x": 10, "y": 20, "width": 100, "height": 50}
+
+        with patch("testcaseer.recorder.save_screenshot") as save:
+            recorder._queue_screenshot(sample_screenshot_bytes, path, box)
+            await recorder._screenshot_queue.join()
+
+        save.assert_called_once_with(sample_screenshot_bytes, path, box)
+        recorder._screenshot_worker.cancel()  # type: ignore[union-attr]
 
 
 @pytest.mark.integration
 class TestRecorderExport:
     """Tests for Recorder export functionality."""
 
-    def test_export_all_formats(self, temp_dir: Path) -> None:
-        """Test that exporters create all output formats."""
-        from testcaseer.exporters import HTMLExporter, JSONExporter, MarkdownExporter
-        
-        # Create output directory
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        (temp_dir / "screenshots").mkdir(exist_ok=True)
-        
-        # Create a minimal testcase directly
-        testcase = TestCase(
-            id="test_id",
-            name="Test",
-            created_at=datetime.now(),
-            start_url="https://example.com",
-            browser="chromium",
-            viewport={"width": 1920, "height": 1080},
-            user_agent="TestAgent/1.0",
-            steps=[],
-            console_logs=[],
-            network_requests=[],
-            page_errors=[],
-            total_duration=0.0,
-            total_steps=0,
+    @pytest.mark.parametrize(
+        ("exporter_cls", "filename"),
+        [
+            (JSONExporter, "testcase.json"),
+            (MarkdownExporter, "testcase.md"),
+            (HTMLExporter, "testcase.html"),
+        ],
+    )
+    def test_export_format(
+        self,
+        temp_dir: Path,
+        screenshots_dir: Path,
+        sample_testcase_minimal: TestCase,
+        exporter_cls: type[BaseExporter],
+        filename: str,
+    ) -> None:
+        """Test that each exporter writes its output file."""
+        exporter_cls().export(sample_testcase_minimal, temp_dir)
+
+        assert (temp_dir / filename).exists()
+
+
+    @pytest.mark.asyncio
+    async def test_export_only_selected_formats(self, temp_dir: Path, sample_step: Step) -> None:
+        """Test that only the configured formats are written."""
+        recorder = Recorder(
+            start_url="https://example.com", output_dir=temp_dir, formats=["json", "html"]
         )
-        
-        # Export using exporters directly (pass directory, not file path)
-        json_exporter = JSONExporter()
-        md_exporter = MarkdownExporter()
-        html_exporter = HTMLExporter()
-        
-        json_exporter.export(testcase, temp_dir)
-        md_exporter.export(testcase, temp_dir)
-        html_exporter.export(testcase, temp_dir)
-        
-        # Check files created
+        recorder.steps.append(sample_step)
+
+        await recorder._export_testcase()
+
         assert (temp_dir / "testcase.json").exists()
-        assert (temp_dir / "testcase.md").exists()
         assert (temp_dir / "testcase.html").exists()
+        assert not (temp_dir / "testcase.md").exists()
+
+    def test_formats_from_one_shot_iterable(self, temp_dir: Path) -> None:
+        """Test that formats given as a generator are not used up by validation."""
+        recorder = Recorder(
+            start_url="https://example.com",
+            output_dir=temp_dir,
+            formats=(fmt for fmt in ["html", "json"]),  # type: ignore[arg-type]
+        )
+
+        assert recorder.formats == ["json", "html"]
+
+    def test_unknown_format_rejected(self, temp_dir: Path) -> None:
+        """Test that an unsupported export format is an error."""
+        with pytest.raises(ValueError, match="pdf"):
+            Recorder(start_url="https://example.com", output_dir=temp_dir, formats=["pdf"])
+
+
+@pytest.mark.integration
+class TestPlaywrightStackCapture:
+    """Tests for the opt-in replacement of Playwright's stack capture."""
+
+    def test_names_api_call_without_frames(self) -> None:
+        """Test that the outermost Playwright method names the call."""
+        from playwright._impl._connection import _PLAYWRIGHT_MODULE_PATH
+
+        source = (
+            "class Page:\n"
+            "    def click(self, capture):\n"
+            "        return wrap_api_call(capture)\n"
+            "def wrap_api_call(capture):\n"
+            "    return capture()\n"
+        )
+        namespace: dict = {}
+        exec(compile(source, os.path.join(_PLAYWRIGHT_MODULE_PATH, "fake.py"), "exec"), namespace)
+
+        info = namespace["Page"]().click(_capture_api_name_only)
+
+        assert info == {"frames": [], "apiName": "Page.click", "title": None}
+
+    def test_disable_replaces_capture(self) -> None:
+        """Test that the patch swaps in the cheap capture function."""
+        from playwright._impl import _connection
+
+        with patch.object(_connection, "_capture_stack_trace", None):
+            _disable_playwright_stack_capture()
+
+            assert _connection._capture_stack_trace is _capture_api_name_only
+
+    def test_disable_warns_without_capture_helper(self) -> None:
+        """Test that Playwright versions without the helper are warned about, not patched."""
+        from playwright._impl import _connection
+
+        with patch.object(_connection, "_capture_stack_trace", None):
+            del _connection._capture_stack_trace
+            with pytest.warns(RuntimeWarning, match="TESTCASEER_PW_INSPECT_STACK"):
+                _disable_playwright_stack_capture()
+
+            assert not hasattr(_connection, "_capture_stack_trace")
@@ -0,0 +1,122 @@
+"""Tests for browser management."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from testcaseer.browser import BrowserManager, BrowserPool
+
+
+@pytest.fixture
+def mock_playwright() -> MagicMock:
+    """Create a mocked Playwright driver whose launchers return fresh browsers."""
+    playwright = MagicMock()
+    playwright.stop = AsyncMock()
+
+    def make_browser(**_: object) -> MagicMock:
+        browser = MagicMock()
+        browser.is_connected = MagicMock(return_value=True)
+        browser.close = AsyncMock()
+        context = MagicMock()
+        context.new_page = AsyncMock(return_value=MagicMock(close=AsyncMock()))
+        context.close = AsyncMock()
+        browser.new_context = AsyncMock(return_value=context)
+        return browser
+
+    for name in ("chromium", "firefox", "webkit"):
+        getattr(playwright, name).launch = AsyncMock(side_effect=make_browser)
+    return playwright
+
+
+@pytest.fixture
+def patched_playwright(mock_playwright: MagicMock):  # type: ignore[no-untyped-def]
+    """Patch async_playwright() to start the mocked driver."""
+    with patch("playwright.async_api.async_playwright") as factory:
+        factory.return_value.start = AsyncMock(return_value=mock_playwright)
+        yield mock_playwright
+
+
+class TestBrowserPool:
+    """Tests for BrowserPool."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_share_one_browser(self, patched_playwright: MagicMock) -> None:
+        """Test that concurrent sessions reuse a single launched browser."""
+        pool = BrowserPool()
+
+        first = BrowserManager(pool=pool, headless=True)
+        second = BrowserManager(pool=pool, headless=True)
+        await first.start()
+        await second.start()
+
+        assert first.browser is second.browser
+        patched_playwright.chromium.launch.assert_called_once()
+
+        shared = first.browser
+        await first.close()
+        shared.close.assert_not_called()
+
+        await second.close()
+        shared.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_last_release_closes_browser(self, patched_playwright: MagicMock) -> None:
+        """Test that the browser closes when its last session ends."""
+        pool = BrowserPool()
+        manager = BrowserManager(pool=pool, headless=True)
+        await manager.start()
+        browser = manager.browser
+
+        await manager.close()
+
+        browser.close.assert_called_once()
+        patched_playwright.stop.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_keep_alive_reuses_browser_between_sessions(
+        self, patched_playwright: MagicMock
+    ) -> None:
+        """Test that keep_alive pools keep the browser for back-to-back sessions."""
+        pool = BrowserPool(keep_alive=True)
+
+        for _ in range(3):
+            manager = BrowserManager(pool=pool, headless=True)
+            await manager.start()
+            await manager.close()
+
+        patched_playwright.chromium.launch.assert_called_once()
+
+        await pool.close()
+        patched_playwright.stop.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_old_session_release_keeps_relaunched_browser(
+        self, patched_playwright: MagicMock
+    ) -> None:
+        """Test that a session on a disconnected browser does not close its replacement."""
+        pool = BrowserPool()
+        old = await pool.acquire("chromium", headless=True)
+        old.is_connected.return_value = False
+
+        new = await pool.acquire("chromium", headless=True)
+        assert new is not old
+
+        await pool.release("chromium", headless=True)
+        new.close.assert_not_called()
+
+        await pool.release("chromium", headless=True)
+        new.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_stops_driver_after_failed_launch(
+        self, patched_playwright: MagicMock
+    ) -> None:
+        """Test that close() stops Playwright even when no browser was launched."""
+        pool = BrowserPool()
+        patched_playwright.chromium.launch.side_effect = RuntimeError("not installed")
+
+        with pytest.raises(RuntimeError):
+            await pool.acquire("chromium", headless=True)
+        await pool.close()
+
+        patched_playwright.stop.assert_called_once()
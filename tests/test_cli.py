@@ -1,49 +1,84 @@
 """Tests for CLI commands."""
 
+import subprocess
+import sys
+from collections.abc import Iterator
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from typer.testing import CliRunner
+import typer
+from typer.testing import CliRunner, Result
 
-from testcaseer.cli import app
+from testcaseer.cli import app, generate_testcase_name, validate_output_dir, validate_url
 
 runner = CliRunner()
 
 
+@pytest.fixture
+def mock_recorder_class() -> Iterator[MagicMock]:
+    """Patch Recorder so the record command runs without a browser."""
+    with patch("testcaseer.recorder.Recorder") as recorder_class:
+        recorder_class.return_value.run = AsyncMock()
+        yield recorder_class
+
+
 class TestVersionCommand:
     """Tests for the version command."""
 
-    def test_version_command(self) -> None:
+    @pytest.fixture(scope="class")
+    def version_result(self) -> Result:
+        """Run the version command once for the whole class."""
+        return runner.invoke(app, ["version"])
+
+    def test_version_command(self, version_result: Result) -> None:
         """Test that version command runs successfully."""
-        result = runner.invoke(app, ["version"])
-        assert result.exit_code == 0
+        assert version_result.exit_code == 0
 
-    def test_version_shows_testcaseer(self) -> None:
+    def test_version_shows_testcaseer(self, version_result: Result) -> None:
         """Test that version shows TestCaseer version."""
-        result = runner.invoke(app, ["version"])
-        assert "TestCaseer" in result.stdout or "testcaseer" in result.stdout.lower()
+        stdout = version_result.stdout
+        assert "TestCaseer" in stdout or "testcaseer" in stdout.lower()
 
-    def test_version_shows_python(self) -> None:
+    def test_version_shows_python(self, version_result: Result) -> None:
         """Test that version shows Python version."""
-        result = runner.invoke(app, ["version"])
-        assert "Python" in result.stdout or "python" in result.stdout.lower()
+        stdout = version_result.stdout
+        assert "Python" in stdout or "python" in stdout.lower()
 
 
 class TestCheckCommand:
     """Tests for the check command."""
 
-    def test_check_command(self) -> None:
+    @pytest.fixture(scope="class")
+    def check_result(self) -> Result:
+        """Run the check command, which launches each browser, once for the whole class."""
+        return runner.invoke(app, ["check"])
+
+    def test_check_command(self, check_result: Result) -> None:
         """Test that check command runs successfully."""
-        result = runner.invoke(app, ["check"])
         # May exit with 1 if browsers not installed, but should run
-        assert result.exit_code in [0, 1]
+        assert check_result.exit_code in [0, 1]
 
-    def test_check_shows_dependencies(self) -> None:
+    def test_check_shows_dependencies(self, check_result: Result) -> None:
         """Test that check shows dependency information."""
-        result = runner.invoke(app, ["check"])
+        stdout = check_result.stdout
         # Should mention Python or dependencies
-        assert "Python" in result.stdout or "Зависимости" in result.stdout or len(result.stdout) > 0
+        assert "Python" in stdout or "Зависимости" in stdout or len(stdout) > 0
+
+    def test_check_reports_each_browser_in_order(self) -> None:
+        """Test that concurrent browser probes are reported in a stable order."""
+        available = {"chromium": True, "firefox": False, "webkit": True}
+        probe = AsyncMock(return_value=list(available.values()))
+        with patch("testcaseer.cli.probe_browsers", probe):
+            result = runner.invoke(app, ["check"])
+
+        lines = [
+            line for line in result.stdout.splitlines() if line[2:].startswith(tuple(available))
+        ]
+        assert [line.split()[1] for line in lines] == ["chromium", "firefox", "webkit"]
+        assert "playwright install firefox" in result.stdout
+        assert "playwright install chromium" not in result.stdout
+        probe.assert_awaited_once_with(["chromium", "firefox", "webkit"])
 
 
 class TestRecordCommand:
@@ -57,54 +92,141 @@ class TestRecordCommand:
 
     def test_record_requires_url(self) -> None:
         """Test that record requires URL argument."""
-        result = runner.invoke(app, ["record"])
+        result = runner.invoke(app, ["record"], catch_exceptions=False)
         assert result.exit_code != 0
 
-    def test_record_url_validation(self, temp_dir: Path) -> None:
+    def test_record_url_validation(self, temp_dir: Path, mock_recorder_class: MagicMock) -> None:
         """Test URL validation - adds https if missing."""
-        with patch("testcaseer.recorder.Recorder") as mock_recorder_class:
-            mock_instance = MagicMock()
-            mock_instance.run = AsyncMock()
-            mock_recorder_class.return_value = mock_instance
-            
-            result = runner.invoke(app, ["record", "example.com", "-o", str(temp_dir)])
-            
-            # Check that recorder was called
-            if mock_recorder_class.called:
-                call_kwargs = mock_recorder_class.call_args.kwargs
-                # URL should have https:// prefix added
-                assert "example.com" in call_kwargs.get("start_url", "")
-
-    def test_record_with_output_dir(self, temp_dir: Path) -> None:
+        result = runner.invoke(app, ["record", "example.com", "-o", str(temp_dir)])
+
+        # Check that recorder was called
+        if mock_recorder_class.called:
+            call_kwargs = mock_recorder_class.call_args.kwargs
+            # URL should have https:// prefix added
+            assert "example.com" in call_kwargs.get("start_url", "")
+
+    def test_record_with_output_dir(self, temp_dir: Path, mock_recorder_class: MagicMock) -> None:
         """Test record with custom output directory."""
-        with patch("testcaseer.recorder.Recorder") as mock_recorder_class:
-            mock_instance = MagicMock()
-            mock_instance.run = AsyncMock()
-            mock_recorder_class.return_value = mock_instance
-            
-            output_path = temp_dir / "test_output"
-            result = runner.invoke(app, ["record", "https://example.com", "-o", str(output_path)])
-            
-            # Should either succeed or fail gracefully
-            assert result.exit_code in [0, 1]
-
-    def test_record_with_browser_option(self, temp_dir: Path) -> None:
+        output_path = temp_dir / "test_output"
+        result = runner.invoke(app, ["record", "https://example.com", "-o", str(output_path)])
+
+        # Should either succeed or fail gracefully
+        assert result.exit_code in [0, 1]
+
+    def test_record_with_browser_option(
+        self, temp_dir: Path, mock_recorder_class: MagicMock
+    ) -> None:
         """Test record with browser option."""
-        with patch("testcaseer.recorder.Recorder") as mock_recorder_class:
-            mock_instance = MagicMock()
-            mock_instance.run = AsyncMock()
-            mock_recorder_class.return_value = mock_instance
-            
-            result = runner.invoke(app, [
-                "record", "https://example.com",
-                "-o", str(temp_dir),
-                "--browser", "firefox"
-            ])
-            
-            # Should accept browser option
-            if mock_recorder_class.called:
-                call_kwargs = mock_recorder_class.call_args.kwargs
-                assert call_kwargs.get("browser_type") == "firefox"
+        result = runner.invoke(
+            app, ["record", "https://example.com", "-o", str(temp_dir), "--browser", "firefox"]
+        )
+
+        # Should accept browser option
+        if mock_recorder_class.called:
+            call_kwargs = mock_recorder_class.call_args.kwargs
+            assert call_kwargs.get("browser_type") == "firefox"
+
+    def test_record_with_format_option(
+        self, temp_dir: Path, mock_recorder_class: MagicMock
+    ) -> None:
+        """Test that --format limits the exported formats."""
+        result = runner.invoke(
+            app, ["record", "https://example.com", "-o", str(temp_dir), "-f", "json", "-f", "html"]
+        )
+
+        assert result.exit_code == 0
+        assert mock_recorder_class.call_args.kwargs["formats"] == ["json", "html"]
+
+    def test_record_defaults_to_all_formats(
+        self, temp_dir: Path, mock_recorder_class: MagicMock
+    ) -> None:
+        """Test that every format is exported when --format is not given."""
+        runner.invoke(app, ["record", "https://example.com", "-o", str(temp_dir)])
+
+        assert mock_recorder_class.call_args.kwargs["formats"] == ["json", "markdown", "html"]
+
+
+class TestValidateURL:
+    """Tests for URL validation."""
+
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("example.com", "https://example.com"),
+            ("http://localhost:8080/app", "http://localhost:8080/app"),
+            ("https://127.0.0.1/login?next=/", "https://127.0.0.1/login?next=/"),
+        ],
+    )
+    def test_accepts_valid_urls(self, url: str, expected: str) -> None:
+        """Test that valid URLs are normalized and accepted."""
+        assert validate_url(url) == expected
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "not a url",
+            "https://intranet",
+            "https://example.com/" + "a" * 2048,
+            "https://example.com/\x00",
+        ],
+    )
+    def test_rejects_invalid_urls(self, url: str) -> None:
+        """Test that malformed URLs are rejected."""
+        with pytest.raises(typer.Exit):
+            validate_url(url)
+
+
+class TestValidateOutputDir:
+    """Tests for output directory validation."""
+
+    def test_reports_created_directory(self, tmp_path: Path) -> None:
+        """Test that a newly created output directory is reported, an existing one is not."""
+        with patch("testcaseer.cli.console") as console:
+            output = validate_output_dir(tmp_path / "new")
+            validate_output_dir(tmp_path / "new")
+
+        printed = [c.args[0] for c in console.print.call_args_list]
+        assert printed == [f"[dim]Created output directory: {output}[/dim]"]
+
+    def test_creates_output_and_screenshots(self, tmp_path: Path) -> None:
+        """Test that missing directories are created."""
+        output = validate_output_dir(tmp_path / "nested" / "out")
+        assert output == (tmp_path / "nested" / "out").resolve()
+        assert (output / "screenshots").is_dir()
+
+    def test_accepts_existing_directory(self, tmp_path: Path) -> None:
+        """Test that an existing directory is reused."""
+        (tmp_path / "screenshots").mkdir()
+        assert validate_output_dir(tmp_path) == tmp_path.resolve()
+
+    def test_rejects_file(self, tmp_path: Path) -> None:
+        """Test that a file in place of the directory is rejected."""
+        target = tmp_path / "out"
+        target.write_text("")
+        with pytest.raises(typer.Exit):
+            validate_output_dir(target)
+
+    def test_reports_file_in_place_of_screenshots(self, tmp_path: Path) -> None:
+        """Test that the error names the screenshots file, not the valid output directory."""
+        (tmp_path / "screenshots").write_text("")
+
+        with patch("testcaseer.cli.console") as console, pytest.raises(typer.Exit):
+            validate_output_dir(tmp_path)
+
+        message = console.print.call_args.args[0]
+        assert message.endswith(str(tmp_path / "screenshots"))
+
+
+class TestGenerateTestcaseName:
+    """Tests for default test case names."""
+
+    def test_name_from_domain(self) -> None:
+        """Test that the www. prefix is dropped."""
+        assert generate_testcase_name("https://www.example.com/") == "example.com"
+
+    def test_name_includes_path(self) -> None:
+        """Test that path segments are joined with underscores."""
+        assert generate_testcase_name("https://example.com/shop/cart") == "example.com_shop_cart"
 
 
 class TestCLIOutput:
@@ -117,17 +239,16 @@ class TestCLIOutput:
         # At minimum, should have some output
         assert len(result.stdout) > 0
 
-    def test_cli_handles_keyboard_interrupt(self, temp_dir: Path) -> None:
+    def test_cli_handles_keyboard_interrupt(
+        self, temp_dir: Path, mock_recorder_class: MagicMock
+    ) -> None:
         """Test that CLI handles Ctrl+C gracefully."""
-        with patch("testcaseer.recorder.Recorder") as mock_recorder_class:
-            mock_instance = MagicMock()
-            mock_instance.run = AsyncMock(side_effect=KeyboardInterrupt)
-            mock_recorder_class.return_value = mock_instance
-            
-            result = runner.invoke(app, ["record", "https://example.com", "-o", str(temp_dir)])
-            
-            # Should exit gracefully, not crash
-            # Exit code can vary but shouldn't be an unhandled exception
+        mock_recorder_class.return_value.run.side_effect = KeyboardInterrupt
+
+        result = runner.invoke(app, ["record", "https://example.com", "-o", str(temp_dir)])
+
+        # Should exit gracefully, not crash
+        # Exit code can vary but shouldn't be an unhandled exception
 
 
 class TestCLIEdgeCases:
@@ -135,17 +256,17 @@ class TestCLIEdgeCases:
 
     def test_empty_url(self) -> None:
         """Test handling of empty URL."""
-        result = runner.invoke(app, ["record", ""])
+        result = runner.invoke(app, ["record", ""], catch_exceptions=False)
         # Should fail with validation error
         assert result.exit_code != 0
 
     def test_invalid_browser(self, temp_dir: Path) -> None:
         """Test handling of invalid browser option."""
-        result = runner.invoke(app, [
-            "record", "https://example.com",
-            "-o", str(temp_dir),
-            "--browser", "invalid_browser"
-        ])
+        result = runner.invoke(
+            app,
+            ["record", "https://example.com", "-o", str(temp_dir), "--browser", "invalid_browser"],
+            catch_exceptions=False,
+        )
         # Should fail with validation error
         assert result.exit_code != 0
 
@@ -154,3 +275,17 @@ class TestCLIEdgeCases:
         result = runner.invoke(app, ["--help"])
         assert result.exit_code == 0
         assert "record" in result.stdout.lower()
+
+
+class TestLazyImports:
+    """Tests for keeping CLI startup light."""
+
+    def test_cli_import_does_not_load_recorder(self) -> None:
+        """Test that importing the CLI defers the recorder, Playwright and Pydantic."""
+        code = (
+            "import sys\n"
+            "import testcaseer.cli\n"
+            "heavy = {'testcaseer.recorder', 'playwright', 'pydantic'} & sys.modules.keys()\n"
+            "assert not heavy, heavy\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
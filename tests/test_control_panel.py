@@ -0,0 +1,163 @@
+"""Tests for the injected control panel."""
+
+import asyncio
+from importlib.resources import files
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import Error
+
+from testcaseer.control_panel import (
+    UPDATE_UI_JS,
+    PanelUpdater,
+    get_control_panel_js,
+    inject_control_panel,
+    minify_js,
+    update_panel_ui,
+)
+
+
+def make_page_without_cdp() -> MagicMock:
+    """Create a mock page whose browser does not support CDP sessions."""
+    mock_page = MagicMock()
+    mock_page.evaluate = AsyncMock()
+    mock_page.context.new_cdp_session = AsyncMock(side_effect=Error("not supported"))
+    return mock_page
+
+
+class TestMinifyJS:
+    """Tests for JavaScript minification."""
+
+    def test_strips_indentation_and_blank_lines(self) -> None:
+        """Test that indentation and empty lines are removed."""
+        source = "(function() {\n    const a = 1;\n\n    return a;\n})();\n"
+        assert minify_js(source) == "(function() {\nconst a = 1;\nreturn a;\n})();"
+
+    def test_strips_full_line_comments(self) -> None:
+        """Test that full-line comments are removed."""
+        source = "    // Don't inject twice\n    run();"
+        assert minify_js(source) == "run();"
+
+    def test_keeps_inline_urls(self) -> None:
+        """Test that '//' inside code is left alone."""
+        source = "const url = 'https://example.com';"
+        assert minify_js(source) == source
+
+    def test_control_panel_is_minified(self) -> None:
+        """Test that the shipped control panel script is smaller than the source."""
+        source = files("testcaseer").joinpath("assets", "control_panel.js").read_text("utf-8")
+        script = get_control_panel_js()
+
+        assert len(script) < len(source)
+        assert "__testcaseer_panel__" in script
+        assert "window.__tc_update" in script
+
+
+class TestInjectControlPanel:
+    """Tests for control panel injection."""
+
+    @pytest.mark.asyncio
+    async def test_injects_only_through_init_script(self) -> None:
+        """Test that the panel is registered once as an init script."""
+        mock_page = make_page_without_cdp()
+        mock_page.expose_function = AsyncMock()
+        mock_page.add_init_script = AsyncMock()
+        mock_page.url = "https://example.com"
+
+        updater = await inject_control_panel(mock_page, MagicMock())
+        await updater.close()
+
+        mock_page.add_init_script.assert_called_once_with(get_control_panel_js())
+        mock_page.evaluate.assert_not_called()
+
+    def test_script_guards_against_double_injection(self) -> None:
+        """Test that the script bails out when already installed."""
+        script = get_control_panel_js()
+
+        assert "window.__tc_panel_version" in script
+        assert "window.__tc_sheet" in script
+
+
+class TestUpdatePanelUI:
+    """Tests for panel state updates."""
+
+    @pytest.mark.asyncio
+    async def test_passes_state_as_argument(self) -> None:
+        """Test that state is sent as an evaluate argument, not interpolated."""
+        mock_page = MagicMock()
+        mock_page.evaluate = AsyncMock()
+
+        await update_panel_ui(mock_page, is_recording=True, steps_count=3, message="it's saved")
+
+        mock_page.evaluate.assert_called_once_with(
+            UPDATE_UI_JS,
+            {"isRecording": True, "stepsCount": 3, "message": "it's saved"},
+        )
+
+    @pytest.mark.asyncio
+    async def test_swallows_evaluate_errors(self) -> None:
+        """Test that a navigating page does not break the update."""
+        mock_page = MagicMock()
+        mock_page.evaluate = AsyncMock(side_effect=Exception("Execution context was destroyed"))
+
+        await update_panel_ui(mock_page, is_recording=False, steps_count=0)
+
+
+class TestPanelUpdater:
+    """Tests for coalesced panel updates."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_burst_into_latest_state(self) -> None:
+        """Test that a burst of scheduled updates sends only the last one."""
+        mock_page = make_page_without_cdp()
+        updater = PanelUpdater(mock_page, delay=0.01)
+        updater.start()
+
+        for count in range(1, 6):
+            updater.schedule(is_recording=True, steps_count=count)
+        await asyncio.sleep(0.05)
+        await updater.close()
+
+        mock_page.evaluate.assert_called_once_with(
+            UPDATE_UI_JS, {"isRecording": True, "stepsCount": 5, "message": ""}
+        )
+
+    @pytest.mark.asyncio
+    async def test_send_supersedes_scheduled_update(self) -> None:
+        """Test that an immediate update drops a stale scheduled one."""
+        mock_page = make_page_without_cdp()
+        updater = PanelUpdater(mock_page, delay=0.01)
+        updater.start()
+
+        updater.schedule(is_recording=True, steps_count=2)
+        await updater.send(is_recording=False, steps_count=2, message="Saving...")
+        await asyncio.sleep(0.05)
+        await updater.close()
+
+        mock_page.evaluate.assert_called_once_with(
+            UPDATE_UI_JS, {"isRecording": False, "stepsCount": 2, "message": "Saving..."}
+        )
+
+    @pytest.mark.asyncio
+    async def test_uses_cdp_session_when_available(self) -> None:
+        """Test that Chromium updates go through a single reused CDP session."""
+        mock_session = MagicMock()
+        mock_session.send = AsyncMock()
+        mock_session.detach = AsyncMock()
+        mock_page = MagicMock()
+        mock_page.evaluate = AsyncMock()
+        mock_page.context.new_cdp_session = AsyncMock(return_value=mock_session)
+        updater = PanelUpdater(mock_page)
+
+        await updater.send(is_recording=True, steps_count=1)
+        await updater.send(is_recording=True, steps_count=2, message="it's saved")
+        await updater.close()
+
+        mock_page.context.new_cdp_session.assert_called_once_with(mock_page)
+        mock_page.evaluate.assert_not_called()
+        assert mock_session.send.call_count == 2
+        method, params = mock_session.send.call_args.args
+        assert method == "Runtime.evaluate"
+        assert params["awaitPromise"] is False
+        assert '"message":"it\'s saved"' in params["expression"]
+        mock_session.detach.assert_called_once()
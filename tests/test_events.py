@@ -0,0 +1,61 @@
+"""Tests for DOM event injection."""
+
+from importlib.resources import files
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from testcaseer.events import get_event_listener_js, setup_event_listeners
+
+
+def make_page(url: str) -> MagicMock:
+    """Create a mock page currently showing the given URL."""
+    mock_page = MagicMock()
+    mock_page.main_frame.url = url
+    mock_page.expose_function = AsyncMock()
+    mock_page.add_init_script = AsyncMock()
+    mock_page.evaluate = AsyncMock()
+    return mock_page
+
+
+class TestSetupEventListeners:
+    """Tests for event listener injection."""
+
+    @pytest.mark.asyncio
+    async def test_blank_page_uses_init_script_only(self) -> None:
+        """Test that a fresh page is covered by the init script alone."""
+        mock_page = make_page("about:blank")
+
+        await setup_event_listeners(mock_page, MagicMock())
+
+        mock_page.add_init_script.assert_called_once_with(get_event_listener_js())
+        mock_page.evaluate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_loaded_page_is_evaluated_once(self) -> None:
+        """Test that an already loaded page gets the listeners right away."""
+        mock_page = make_page("https://example.com")
+
+        await setup_event_listeners(mock_page, MagicMock())
+
+        mock_page.evaluate.assert_called_once_with(get_event_listener_js())
+
+
+class TestGetEventListenerJs:
+    """Tests for loading the event listener script."""
+
+    def test_script_is_minified(self) -> None:
+        """Test that the injected script is smaller than the shipped source."""
+        source = files("testcaseer").joinpath("assets", "event_listener.js").read_text("utf-8")
+        script = get_event_listener_js()
+
+        assert len(script) < len(source)
+        assert "__testcaseer_events_injected" in script
+
+    def test_script_has_stable_source_url(self) -> None:
+        """Test that the script is named so the browser can cache it."""
+        assert get_event_listener_js().endswith("//# sourceURL=testcaseer-events.js")
+
+    def test_script_is_loaded_once(self) -> None:
+        """Test that repeated calls reuse the cached script."""
+        assert get_event_listener_js() is get_event_listener_js()
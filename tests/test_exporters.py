@@ -1,17 +1,39 @@
 """Tests for exporters."""
 
+import base64
 import json
+import os
+import subprocess
+import sys
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 import pytest
 
 from testcaseer.exporters import HTMLExporter, JSONExporter, MarkdownExporter
-from testcaseer.models import TestCase
+from testcaseer.exporters.base import _write_if_changed
+from testcaseer.exporters.html_exporter import _encode_file_base64
+from testcaseer.models import NetworkRequest, TestCase
+
+REQUIRED_JSON_FIELDS = frozenset({
+    "id", "name", "created_at", "start_url", "browser",
+    "viewport", "user_agent", "steps", "console_logs",
+    "network_requests", "page_errors", "total_duration", "total_steps",
+})
 
 
 class TestJSONExporter:
     """Tests for JSON exporter."""
 
+    @pytest.fixture(scope="class")
+    def json_data(
+        self, sample_testcase: TestCase, tmp_path_factory: pytest.TempPathFactory
+    ) -> dict[str, Any]:
+        """Export the sample test case once and parse the result."""
+        output_path = JSONExporter().export(sample_testcase, tmp_path_factory.mktemp("json"))
+        return json.loads(output_path.read_text(encoding="utf-8"))
+
     def test_export_creates_file(self, sample_testcase: TestCase, temp_dir: Path) -> None:
         """Test that export creates a JSON file."""
         exporter = JSONExporter()
@@ -20,44 +42,21 @@ class TestJSONExporter:
         assert output_path.exists()
         assert output_path.name == "testcase.json"
 
-    def test_export_valid_json(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_valid_json(self, json_data: dict[str, Any]) -> None:
         """Test that exported file is valid JSON."""
-        exporter = JSONExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        data = json.loads(content)
-        
-        assert isinstance(data, dict)
-        assert data["id"] == "tc_001"
-        assert data["name"] == "Тест авторизации"
+        assert isinstance(json_data, dict)
+        assert json_data["id"] == "tc_001"
+        assert json_data["name"] == "Тест авторизации"
 
-    def test_export_contains_all_fields(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_contains_all_fields(self, json_data: dict[str, Any]) -> None:
         """Test that exported JSON contains all required fields."""
-        exporter = JSONExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        data = json.loads(content)
-        
-        required_fields = [
-            "id", "name", "created_at", "start_url", "browser",
-            "viewport", "user_agent", "steps", "console_logs",
-            "network_requests", "page_errors", "total_duration", "total_steps"
-        ]
-        for field in required_fields:
-            assert field in data, f"Missing field: {field}"
-
-    def test_export_steps_structure(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+        missing = REQUIRED_JSON_FIELDS - json_data.keys()
+        assert not missing, f"Missing fields: {sorted(missing)}"
+
+    def test_export_steps_structure(self, json_data: dict[str, Any]) -> None:
         """Test that steps are properly structured in JSON."""
-        exporter = JSONExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        data = json.loads(content)
-        
-        assert len(data["steps"]) == 2
-        step = data["steps"][0]
+        assert len(json_data["steps"]) == 2
+        step = json_data["steps"][0]
         assert "number" in step
         assert "action_type" in step
         assert "description_short" in step
@@ -76,9 +75,27 @@ class TestJSONExporter:
         assert data["total_steps"] == 0
 
 
+    def test_export_keeps_unicode_unescaped(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+        """Test that non-ASCII text is written as UTF-8, not \\u escapes."""
+        exporter = JSONExporter()
+        output_path = exporter.export(sample_testcase, temp_dir)
+
+        content = output_path.read_text(encoding="utf-8")
+        assert "Тест авторизации" in content
+        assert json.loads(content) == sample_testcase.model_dump(mode="json")
+
+
 class TestMarkdownExporter:
     """Tests for Markdown exporter."""
 
+    @pytest.fixture(scope="class")
+    def markdown_content(
+        self, sample_testcase: TestCase, tmp_path_factory: pytest.TempPathFactory
+    ) -> str:
+        """Export the sample test case once and read the result."""
+        output_path = MarkdownExporter().export(sample_testcase, tmp_path_factory.mktemp("md"))
+        return output_path.read_text(encoding="utf-8")
+
     def test_export_creates_file(self, sample_testcase: TestCase, temp_dir: Path) -> None:
         """Test that export creates a Markdown file."""
         exporter = MarkdownExporter()
@@ -87,42 +104,26 @@ class TestMarkdownExporter:
         assert output_path.exists()
         assert output_path.name == "testcase.md"
 
-    def test_export_contains_title(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_contains_title(self, markdown_content: str) -> None:
         """Test that exported Markdown contains title."""
-        exporter = MarkdownExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        assert "# Тест-кейс: Тест авторизации" in content
+        assert "# Тест-кейс: Тест авторизации" in markdown_content
 
-    def test_export_contains_metadata(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_contains_metadata(self, markdown_content: str) -> None:
         """Test that exported Markdown contains metadata."""
-        exporter = MarkdownExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        assert "**ID:**" in content
-        assert "tc_001" in content
-        assert "**Браузер:**" in content
-        assert "chromium" in content
+        assert "**ID:**" in markdown_content
+        assert "tc_001" in markdown_content
+        assert "**Браузер:**" in markdown_content
+        assert "chromium" in markdown_content
 
-    def test_export_contains_steps(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_contains_steps(self, markdown_content: str) -> None:
         """Test that exported Markdown contains steps."""
-        exporter = MarkdownExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        assert "## Шаги" in content
-        assert "### Шаг 1:" in content
-        assert "### Шаг 2:" in content
+        assert "## Шаги" in markdown_content
+        assert "### Шаг 1:" in markdown_content
+        assert "### Шаг 2:" in markdown_content
 
-    def test_export_contains_summary(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_contains_summary(self, markdown_content: str) -> None:
         """Test that exported Markdown contains summary."""
-        exporter = MarkdownExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        assert "## Итоги" in content or "Итоги" in content
+        assert "## Итоги" in markdown_content or "Итоги" in markdown_content
 
     def test_export_minimal_testcase(self, sample_testcase_minimal: TestCase, temp_dir: Path) -> None:
         """Test exporting minimal TestCase."""
@@ -136,6 +137,14 @@ class TestMarkdownExporter:
 class TestHTMLExporter:
     """Tests for HTML exporter."""
 
+    @pytest.fixture(scope="class")
+    def html_content(
+        self, sample_testcase: TestCase, tmp_path_factory: pytest.TempPathFactory
+    ) -> str:
+        """Export the sample test case once and read the result."""
+        output_path = HTMLExporter().export(sample_testcase, tmp_path_factory.mktemp("html"))
+        return output_path.read_text(encoding="utf-8")
+
     def test_export_creates_file(self, sample_testcase: TestCase, temp_dir: Path) -> None:
         """Test that export creates an HTML file."""
         exporter = HTMLExporter()
@@ -144,57 +153,33 @@ class TestHTMLExporter:
         assert output_path.exists()
         assert output_path.name == "testcase.html"
 
-    def test_export_valid_html(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_valid_html(self, html_content: str) -> None:
         """Test that exported file is valid HTML."""
-        exporter = HTMLExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        assert content.startswith("<!DOCTYPE html>")
-        assert "</html>" in content
+        assert html_content.startswith("<!DOCTYPE html>")
+        assert "</html>" in html_content
 
-    def test_export_contains_title(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_contains_title(self, html_content: str) -> None:
         """Test that exported HTML contains title."""
-        exporter = HTMLExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        assert "<title>Тест авторизации — TestCaseer</title>" in content
+        assert "<title>Тест авторизации — TestCaseer</title>" in html_content
 
-    def test_export_contains_metadata(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_contains_metadata(self, html_content: str) -> None:
         """Test that exported HTML contains metadata."""
-        exporter = HTMLExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        assert "tc_001" in content
-        assert "chromium" in content
-        assert "1920" in content  # viewport width
+        assert "tc_001" in html_content
+        assert "chromium" in html_content
+        assert "1920" in html_content  # viewport width
 
-    def test_export_contains_steps(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_contains_steps(self, html_content: str) -> None:
         """Test that exported HTML contains steps."""
-        exporter = HTMLExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        assert "Шаги" in content or "step" in content.lower()
+        assert "Шаги" in html_content or "step" in html_content.lower()
 
-    def test_export_contains_styles(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_contains_styles(self, html_content: str) -> None:
         """Test that exported HTML contains CSS styles."""
-        exporter = HTMLExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        assert "<style>" in content
-        assert "</style>" in content
+        assert "<style>" in html_content
+        assert "</style>" in html_content
 
-    def test_export_contains_tabs(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+    def test_export_contains_tabs(self, html_content: str) -> None:
         """Test that exported HTML contains tabs for navigation."""
-        exporter = HTMLExporter()
-        output_path = exporter.export(sample_testcase, temp_dir)
-        
-        content = output_path.read_text(encoding="utf-8")
-        assert "tab" in content.lower()
+        assert "tab" in html_content.lower()
 
     def test_export_minimal_testcase(self, sample_testcase_minimal: TestCase, temp_dir: Path) -> None:
         """Test exporting minimal TestCase."""
@@ -219,3 +204,170 @@ class TestHTMLExporter:
         # Check for base64 image data
         assert "data:image/png;base64," in content
 
+    def test_embed_webp_screenshots(self, sample_testcase: TestCase, screenshots_dir: Path) -> None:
+        """Test that WebP screenshots get a matching data URL type."""
+        step = sample_testcase.steps[0].model_copy(
+            update={"screenshot_path": Path("screenshots/001_click_button.webp")}
+        )
+        testcase = sample_testcase.model_copy(update={"steps": [step]})
+        (screenshots_dir / "001_click_button.webp").write_bytes(b"RIFF")
+
+        output_path = HTMLExporter().export(testcase, screenshots_dir.parent)
+
+        assert "data:image/webp;base64," in output_path.read_text(encoding="utf-8")
+
+
+
+    def test_embed_screenshots_keeps_step_order(self, sample_testcase: TestCase, screenshots_dir: Path) -> None:
+        """Test that concurrently encoded screenshots land on their own steps."""
+        (screenshots_dir / "001_click_button.png").write_bytes(b"first")
+        (screenshots_dir / "002_input_email.png").write_bytes(b"second")
+
+        screenshots = HTMLExporter()._embed_screenshots(sample_testcase, screenshots_dir.parent)
+
+        prefix = "data:image/png;base64,"
+        assert screenshots == {
+            1: prefix + base64.b64encode(b"first").decode(),
+            2: prefix + base64.b64encode(b"second").decode(),
+        }
+
+
+class TestTemplateCache:
+    """Tests for shared template compilation."""
+
+    def test_exporters_share_compiled_template(self) -> None:
+        """Test that instances reuse one compiled template per process."""
+        assert HTMLExporter().template is HTMLExporter().template
+        assert MarkdownExporter().template is not HTMLExporter().template
+
+    def test_exporter_without_template_name(self) -> None:
+        """Test that asking for a template without TEMPLATE_NAME fails clearly."""
+        with pytest.raises(TypeError, match="TEMPLATE_NAME"):
+            _ = JSONExporter().template
+
+
+class TestEncodeFileBase64:
+    """Tests for chunked base64 encoding of screenshots."""
+
+    def test_matches_one_shot_encoding(self, temp_dir: Path) -> None:
+        """Test that chunked output equals encoding the whole file at once."""
+        data = bytes(range(256)) * 1000 + b"tail"
+        path = temp_dir / "shot.png"
+        path.write_bytes(data)
+
+        assert _encode_file_base64(path) == base64.b64encode(data).decode()
+
+    def test_empty_file(self, temp_dir: Path) -> None:
+        """Test that an empty file encodes to an empty string."""
+        path = temp_dir / "empty.png"
+        path.write_bytes(b"")
+
+        assert _encode_file_base64(path) == ""
+
+
+class TestExporterDedupe:
+    """Tests for collapsing repeated timeline entries on export."""
+
+    @pytest.fixture
+    def polling_testcase(self, make_testcase: Callable[..., TestCase]) -> TestCase:
+        """Create a test case with five identical polling requests."""
+        request = NetworkRequest(
+            method="GET", url="https://api.example.com/poll", status=200, resource_type="xhr"
+        )
+        return make_testcase(network_requests=[request] * 5)
+
+    def test_json_collapses_with_dedupe(self, polling_testcase: TestCase, temp_dir: Path) -> None:
+        """Test that dedupe=True writes repeated requests once with a count."""
+        output_path = JSONExporter(dedupe=True).export(polling_testcase, temp_dir)
+
+        data = json.loads(output_path.read_text(encoding="utf-8"))
+        assert [req["count"] for req in data["network_requests"]] == [5]
+
+    def test_json_keeps_raw_list_by_default(
+        self, polling_testcase: TestCase, temp_dir: Path
+    ) -> None:
+        """Test that JSON writes every entry unless dedupe is requested."""
+        output_path = JSONExporter().export(polling_testcase, temp_dir)
+
+        data = json.loads(output_path.read_text(encoding="utf-8"))
+        assert [req["count"] for req in data["network_requests"]] == [1] * 5
+
+    def test_html_shows_repeat_count(self, polling_testcase: TestCase, temp_dir: Path) -> None:
+        """Test that the report shows how often a request repeated."""
+        content = HTMLExporter().export(polling_testcase, temp_dir).read_text(encoding="utf-8")
+
+        assert "×5" in content
+        assert "Сеть (5)" in content
+
+    def test_markdown_shows_repeat_count(self, polling_testcase: TestCase, temp_dir: Path) -> None:
+        """Test that the Markdown summary still counts every request."""
+        content = MarkdownExporter().export(polling_testcase, temp_dir).read_text(encoding="utf-8")
+
+        assert "×5" in content
+        assert "| Сетевых запросов | 5 |" in content
+
+
+class TestExportMany:
+    """Tests for batch export."""
+
+    @pytest.mark.parametrize("exporter_cls", [JSONExporter, MarkdownExporter, HTMLExporter])
+    def test_exports_each_case_into_own_directory(
+        self, exporter_cls: type, sample_testcase: TestCase, temp_dir: Path
+    ) -> None:
+        """Test that every test case is written under its id, in order."""
+        second = sample_testcase.model_copy(update={"id": "tc_002"})
+
+        paths = exporter_cls().export_many([sample_testcase, second], temp_dir)
+
+        assert [path.parent.name for path in paths] == ["tc_001", "tc_002"]
+        assert all(path.exists() for path in paths)
+
+    def test_html_batch_embeds_screenshots(
+        self, sample_testcase: TestCase, temp_dir: Path, sample_screenshot_bytes: bytes
+    ) -> None:
+        """Test that screenshots are embedded when encoded on the shared pool."""
+        screenshots = temp_dir / sample_testcase.id / "screenshots"
+        screenshots.mkdir(parents=True)
+        (screenshots / "001_click_button.png").write_bytes(sample_screenshot_bytes)
+
+        exporter = HTMLExporter()
+        [path] = exporter.export_many([sample_testcase], temp_dir)
+
+        assert "data:image/png;base64," in path.read_text(encoding="utf-8")
+        assert exporter._executor is None
+
+
+class TestLazyImports:
+    """Tests for deferred exporter imports."""
+
+    def test_json_export_does_not_load_jinja2(self) -> None:
+        """Test that the JSON exporter alone never imports Jinja2."""
+        code = (
+            "import sys\n"
+            "from testcaseer.exporters import JSONExporter\n"
+            "JSONExporter()\n"
+            "assert 'jinja2' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+
+class TestWriteIfChanged:
+    """Tests for skipping unchanged output files."""
+
+    def test_skips_identical_content(self, temp_dir: Path) -> None:
+        """Test that an up-to-date file is left alone."""
+        path = temp_dir / "out.json"
+
+        assert _write_if_changed(path, b"{}") is True
+        assert _write_if_changed(path, b"{}") is False
+        assert _write_if_changed(path, b"[]") is True
+        assert path.read_bytes() == b"[]"
+
+    def test_reexport_keeps_file_untouched(self, sample_testcase: TestCase, temp_dir: Path) -> None:
+        """Test that exporting the same test case twice writes the file once."""
+        output_path = JSONExporter().export(sample_testcase, temp_dir)
+        os.utime(output_path, (0, 0))
+
+        JSONExporter().export(sample_testcase, temp_dir)
+
+        assert output_path.stat().st_mtime == 0
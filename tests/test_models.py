@@ -1,10 +1,12 @@
 """Tests for Pydantic models."""
 
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 import pytest
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from testcaseer.models import (
     ConsoleLog,
@@ -15,6 +17,11 @@ from testcaseer.models import (
     TestCase,
 )
 
+_FIXED_TS = datetime(2024, 1, 1, 0, 0, 0)
+
+# Built once: constructing a TypeAdapter compiles a fresh validator.
+_STEP_LIST_ADAPTER = TypeAdapter(list[Step])
+
 
 class TestElementInfo:
     """Tests for ElementInfo model."""
@@ -52,12 +59,24 @@ class TestElementInfo:
 
     def test_element_info_missing_required_field(self) -> None:
         """Test that missing required fields raise ValidationError."""
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValidationError, match="tag_name"):
             ElementInfo(
                 selector="div",
                 # missing tag_name and bounding_box
             )  # type: ignore[call-arg]
 
+    def test_bounding_box_rounded_to_pixels(self) -> None:
+        """Test that sub-pixel coordinates are stored as whole pixels."""
+        element = ElementInfo(
+            selector="div",
+            tag_name="div",
+            bounding_box={"x": 10.4, "y": 20.6, "width": 99.5, "height": 0.2},
+        )
+
+        assert element.bounding_box == {"x": 10, "y": 21, "width": 100, "height": 0}
+        assert all(type(v) is int for v in element.bounding_box.values())
+        assert '"x":10,' in element.model_dump_json()
+
 
 class TestNetworkRequest:
     """Tests for NetworkRequest model."""
@@ -67,7 +86,7 @@ class TestNetworkRequest:
         assert sample_network_request.method == "POST"
         assert sample_network_request.status == 200
         assert sample_network_request.resource_type == "xhr"
-        assert "application/json" in sample_network_request.request_headers.get("Content-Type", "")
+        assert sample_network_request.request_headers["Content-Type"] == "application/json"
 
     def test_network_request_minimal(self) -> None:
         """Test creating NetworkRequest with minimal fields."""
@@ -112,19 +131,18 @@ class TestConsoleLog:
         assert "initialized" in sample_console_log.message
         assert sample_console_log.source is not None
 
-    def test_console_log_all_levels(self) -> None:
+    @pytest.mark.parametrize("level", ["log", "info", "warn", "error", "debug", "trace"])
+    def test_console_log_all_levels(self, level: str) -> None:
         """Test ConsoleLog with all valid levels."""
-        levels = ["log", "info", "warn", "error", "debug", "trace"]
-        for level in levels:
-            log = ConsoleLog(
-                level=level,  # type: ignore[arg-type]
-                message=f"Test message with level {level}",
-            )
-            assert log.level == level
+        log = ConsoleLog(
+            level=level,  # type: ignore[arg-type]
+            message=f"Test message with level {level}",
+        )
+        assert log.level == level
 
     def test_console_log_invalid_level(self) -> None:
         """Test that invalid level raises ValidationError."""
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValidationError, match="level"):
             ConsoleLog(
                 level="invalid",  # type: ignore[arg-type]
                 message="Test",
@@ -173,28 +191,30 @@ class TestStep:
         assert sample_step_with_input.action_type == "input"
         assert sample_step_with_input.input_value == "user@example.com"
 
-    def test_step_action_types(self) -> None:
-        """Test all valid action types."""
-        action_types = [
+    @pytest.mark.parametrize(
+        "action_type",
+        [
             "click", "dblclick", "input", "select", "check",
             "uncheck", "navigate", "scroll", "hover", "keypress", "wait"
-        ]
-        for action_type in action_types:
-            step = Step(
-                number=1,
-                timestamp=datetime.now(),
-                action_type=action_type,  # type: ignore[arg-type]
-                description_short=f"Test {action_type}",
-                description_detailed=f"Testing {action_type} action",
-            )
-            assert step.action_type == action_type
+        ],
+    )
+    def test_step_action_types(self, action_type: str) -> None:
+        """Test all valid action types."""
+        step = Step(
+            number=1,
+            timestamp=_FIXED_TS,
+            action_type=action_type,  # type: ignore[arg-type]
+            description_short=f"Test {action_type}",
+            description_detailed=f"Testing {action_type} action",
+        )
+        assert step.action_type == action_type
 
     def test_step_invalid_action_type(self) -> None:
         """Test that invalid action type raises ValidationError."""
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValidationError, match="action_type"):
             Step(
                 number=1,
-                timestamp=datetime.now(),
+                timestamp=_FIXED_TS,
                 action_type="invalid_action",  # type: ignore[arg-type]
                 description_short="Test",
                 description_detailed="Test",
@@ -220,6 +240,12 @@ class TestStep:
         assert len(step.console_logs) == 1
         assert step.console_logs[0].level == "info"
 
+    def test_step_list_round_trip(self, sample_testcase: TestCase) -> None:
+        """Test that a steps array survives a JSON round trip."""
+        raw = _STEP_LIST_ADAPTER.dump_json(sample_testcase.steps)
+
+        assert _STEP_LIST_ADAPTER.validate_json(raw) == sample_testcase.steps
+
 
 class TestTestCase:
     """Tests for TestCase model."""
@@ -243,9 +269,9 @@ class TestTestCase:
         assert sample_testcase.viewport["width"] == 1920
         assert sample_testcase.viewport["height"] == 1080
 
-    def test_testcase_serialization(self, sample_testcase: TestCase) -> None:
+    def test_testcase_serialization(self, sample_testcase_dump: dict[str, Any]) -> None:
         """Test TestCase JSON serialization."""
-        data = sample_testcase.model_dump()
+        data = sample_testcase_dump
         assert data["id"] == "tc_001"
         assert "steps" in data
         assert len(data["steps"]) == 2
@@ -253,16 +279,38 @@ class TestTestCase:
         assert "network_requests" in data
         assert "page_errors" in data
 
-    def test_testcase_json_round_trip(self, sample_testcase: TestCase) -> None:
+    def test_testcase_json_round_trip(
+        self, sample_testcase: TestCase, sample_testcase_json: str
+    ) -> None:
         """Test that TestCase can be serialized and deserialized."""
-        json_str = sample_testcase.model_dump_json()
-        restored = TestCase.model_validate_json(json_str)
+        restored = TestCase.model_validate_json(sample_testcase_json)
         
         assert restored.id == sample_testcase.id
         assert restored.name == sample_testcase.name
         assert len(restored.steps) == len(sample_testcase.steps)
         assert restored.total_duration == sample_testcase.total_duration
 
+    def test_testcase_from_json(self, sample_testcase: TestCase, sample_testcase_json: str) -> None:
+        """Test loading a TestCase from exported JSON."""
+        restored = TestCase.from_json(sample_testcase_json.encode())
+
+        assert restored == sample_testcase
+
+    def test_testcase_from_dict(self, sample_testcase: TestCase) -> None:
+        """Test loading a TestCase from a plain dict with nested models."""
+        restored = TestCase.from_dict(sample_testcase.model_dump(mode="json"))
+
+        assert restored == sample_testcase
+        assert isinstance(restored.network_requests[0], NetworkRequest)
+
+    def test_testcase_from_dict_invalid(self, sample_testcase: TestCase) -> None:
+        """Test that invalid nested entries are still rejected."""
+        data = sample_testcase.model_dump(mode="json")
+        data["console_logs"][0]["level"] = "bogus"
+
+        with pytest.raises(ValidationError):
+            TestCase.from_dict(data)
+
     def test_testcase_with_logs_and_errors(self, sample_testcase: TestCase) -> None:
         """Test TestCase with console logs and page errors."""
         assert len(sample_testcase.console_logs) == 1
@@ -270,3 +318,46 @@ class TestTestCase:
         assert sample_testcase.console_logs[0].level == "info"
         assert "TypeError" in sample_testcase.page_errors[0].message
 
+    def test_collapse_repeats_merges_consecutive_entries(
+        self, make_testcase: Callable[..., TestCase]
+    ) -> None:
+        """Test that runs of identical logs and requests become one counted entry."""
+        logs = [
+            ConsoleLog(level="log", message="tick"),
+            ConsoleLog(level="log", message="tick"),
+            ConsoleLog(level="warn", message="tick"),
+            ConsoleLog(level="log", message="tick"),
+        ]
+        request = NetworkRequest(
+            method="GET", url="https://api.example.com/poll", status=200, resource_type="xhr"
+        )
+        requests = [request] * 3
+        testcase = make_testcase(console_logs=logs, network_requests=requests)
+
+        collapsed = testcase.collapse_repeats()
+
+        assert [(log.level, log.count) for log in collapsed.console_logs] == [
+            ("log", 2),
+            ("warn", 1),
+            ("log", 1),
+        ]
+        assert [req.count for req in collapsed.network_requests] == [3]
+        # The original is left untouched
+        assert [log.count for log in testcase.console_logs] == [1, 1, 1, 1]
+
+    def test_collapse_repeats_merges_step_entries(
+        self, sample_step: Step, make_testcase: Callable[..., TestCase]
+    ) -> None:
+        """Test that each step's own logs and requests are collapsed too."""
+        log = ConsoleLog(level="log", message="tick")
+        request = NetworkRequest(
+            method="GET", url="https://api.example.com/poll", status=200, resource_type="xhr"
+        )
+        step = sample_step.model_copy(
+            update={"console_logs": [log] * 2, "network_requests": [request] * 4}
+        )
+
+        collapsed = make_testcase(steps=[step]).collapse_repeats()
+
+        assert [entry.count for entry in collapsed.steps[0].console_logs] == [2]
+        assert [entry.count for entry in collapsed.steps[0].network_requests] == [4]
@@ -1,41 +1,39 @@
 """Tests for screenshot functionality."""
 
+from io import BytesIO
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from PIL import Image
 
-from testcaseer.screenshot import generate_screenshot_filename, take_screenshot
+from testcaseer.screenshot import (
+    _draw_highlight,
+    add_highlight_box,
+    generate_screenshot_filename,
+    save_screenshot,
+    take_screenshot,
+)
+
+# PNG files start with these bytes
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 
 
 class TestGenerateScreenshotFilename:
     """Tests for screenshot filename generation."""
 
-    def test_generates_filename(self) -> None:
-        """Test that function generates a filename."""
-        filename = generate_screenshot_filename(1, "click", "button")
-        assert isinstance(filename, str)
-        assert len(filename) > 0
-
-    def test_filename_includes_step_number(self) -> None:
-        """Test that filename includes step number."""
-        filename = generate_screenshot_filename(5, "click", "button")
-        assert "005" in filename or "5" in filename
-
-    def test_filename_includes_action_type(self) -> None:
-        """Test that filename includes action type."""
-        filename = generate_screenshot_filename(1, "click", "button")
-        assert "click" in filename.lower()
-
-    def test_filename_includes_element(self) -> None:
-        """Test that filename includes element info."""
-        filename = generate_screenshot_filename(1, "click", "submitBtn")
-        assert "submitBtn" in filename or "submit" in filename.lower()
-
-    def test_filename_has_png_extension(self) -> None:
-        """Test that filename has .png extension."""
-        filename = generate_screenshot_filename(1, "click", "button")
-        assert filename.endswith(".png")
+    @pytest.mark.parametrize(
+        ("args", "expected"),
+        [
+            ((1, "click", "button"), "001_click_button.webp"),
+            ((5, "click", "button"), "005_click_button.webp"),
+            ((1, "click", "submitBtn"), "001_click_submitBtn.webp"),
+            ((3, "navigate"), "003_navigate.webp"),
+        ],
+    )
+    def test_generates_filename(self, args: tuple, expected: str) -> None:
+        """Test the step number, action, element and extension parts of the filename."""
+        assert generate_screenshot_filename(*args) == expected
 
     def test_filename_sanitizes_special_chars(self) -> None:
         """Test that special characters are handled."""
@@ -57,12 +55,16 @@ class TestGenerateScreenshotFilename:
 class TestTakeScreenshot:
     """Tests for take_screenshot function."""
 
+    @pytest.fixture
+    def mock_page(self, sample_screenshot_bytes: bytes) -> MagicMock:
+        """Create a page whose screenshot() returns the sample PNG."""
+        page = MagicMock()
+        page.screenshot = AsyncMock(return_value=sample_screenshot_bytes)
+        return page
+
     @pytest.mark.asyncio
-    async def test_take_screenshot_calls_page_screenshot(self, temp_dir: Path) -> None:
+    async def test_take_screenshot_calls_page_screenshot(self, temp_dir: Path, mock_page: MagicMock) -> None:
         """Test that take_screenshot calls page.screenshot()."""
-        mock_page = MagicMock()
-        mock_page.screenshot = AsyncMock()
-        
         output_path = temp_dir / "test.png"
         
         result = await take_screenshot(mock_page, output_path)
@@ -70,11 +72,8 @@ class TestTakeScreenshot:
         mock_page.screenshot.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_take_screenshot_returns_path(self, temp_dir: Path) -> None:
+    async def test_take_screenshot_returns_path(self, temp_dir: Path, mock_page: MagicMock) -> None:
         """Test that take_screenshot returns a Path."""
-        mock_page = MagicMock()
-        mock_page.screenshot = AsyncMock()
-        
         output_path = temp_dir / "test.png"
         
         result = await take_screenshot(mock_page, output_path)
@@ -83,11 +82,8 @@ class TestTakeScreenshot:
         assert "test.png" in str(result)
 
     @pytest.mark.asyncio
-    async def test_take_screenshot_uses_correct_path(self, temp_dir: Path) -> None:
+    async def test_take_screenshot_uses_correct_path(self, temp_dir: Path, mock_page: MagicMock) -> None:
         """Test that screenshot is saved to correct path."""
-        mock_page = MagicMock()
-        mock_page.screenshot = AsyncMock()
-        
         output_path = temp_dir / "screenshot.png"
         
         result = await take_screenshot(mock_page, output_path)
@@ -96,21 +92,123 @@ class TestTakeScreenshot:
         assert result == output_path
 
     @pytest.mark.asyncio
-    async def test_take_screenshot_with_highlight(self, temp_dir: Path) -> None:
+    async def test_take_screenshot_with_highlight(self, temp_dir: Path, mock_page: MagicMock) -> None:
         """Test screenshot with element highlight."""
-        mock_page = MagicMock()
-        mock_page.screenshot = AsyncMock()
         mock_element = MagicMock()
         mock_element.bounding_box = AsyncMock(return_value={"x": 10, "y": 20, "width": 100, "height": 50})
         mock_page.query_selector = AsyncMock(return_value=mock_element)
-        
         output_path = temp_dir / "highlight.png"
-        
-        # This will try to add highlight but fail since file doesn't exist
-        # That's ok - we're testing the call flow
-        result = await take_screenshot(mock_page, output_path, highlight_selector="button#test")
-        
+
+        with patch("testcaseer.screenshot.save_screenshot", return_value=output_path) as save:
+            await take_screenshot(mock_page, output_path, highlight_selector="button#test")
+
         mock_page.query_selector.assert_called_once_with("button#test")
+        assert save.call_args.args[2] == {"x": 10, "y": 20, "width": 100, "height": 50}
+
+    @pytest.mark.asyncio
+    async def test_take_screenshot_missing_element_keeps_screenshot(
+        self, temp_dir: Path, mock_page: MagicMock
+    ) -> None:
+        """Test that a selector matching nothing saves the screenshot without a box."""
+        mock_page.query_selector = AsyncMock(return_value=None)
+        output_path = temp_dir / "plain.png"
+
+        with patch("testcaseer.screenshot.save_screenshot", return_value=output_path) as save:
+            await take_screenshot(mock_page, output_path, highlight_selector="button#gone")
+
+        assert save.call_args.args[2] is None
+
+
+class TestSaveScreenshot:
+    """Tests for writing captured screenshots."""
+
+    def test_writes_webp(self, temp_dir: Path, sample_screenshot_bytes: bytes) -> None:
+        """Test that the captured PNG is saved as WebP, creating the directory."""
+        output_path = temp_dir / "screenshots" / "001_click.webp"
+
+        result = save_screenshot(sample_screenshot_bytes, output_path)
+
+        assert result == output_path
+        with Image.open(output_path) as img:
+            assert img.format == "WEBP"
+            assert img.size == (1, 1)
+
+    def test_draws_highlight(self, temp_dir: Path) -> None:
+        """Test that the highlight box is drawn into the saved image."""
+        buffer = BytesIO()
+        Image.new("RGB", (40, 40), "white").save(buffer, "PNG")
+        output_path = temp_dir / "highlight.webp"
+
+        save_screenshot(buffer.getvalue(), output_path, {"x": 10, "y": 10, "width": 20, "height": 20})
+
+        with Image.open(output_path) as img:
+            red, green, _ = img.convert("RGB").getpixel((10, 20))
+            assert red > 150 and green < 100
+            assert img.convert("RGB").getpixel((20, 20)) == (255, 255, 255)
+
+    def test_highlight_failure_keeps_screenshot(self, temp_dir: Path) -> None:
+        """Test that an undecodable image is still saved unannotated, as .png."""
+        output_path = temp_dir / "broken.webp"
+        box = {"x": 0, "y": 0, "width": 1, "height": 1}
+
+        result = save_screenshot(b"not a png", output_path, box)
+
+        assert result == temp_dir / "broken.png"
+        assert result.read_bytes() == b"not a png"
+        assert not output_path.exists()
+
+    def test_missing_encoder_falls_back_to_png(
+        self, temp_dir: Path, sample_screenshot_bytes: bytes
+    ) -> None:
+        """Test that a Pillow build without the WebP encoder keeps the PNG capture."""
+        output_path = temp_dir / "001_click.webp"
+
+        with patch.object(Image.Image, "save", side_effect=KeyError("WEBP")):
+            result = save_screenshot(sample_screenshot_bytes, output_path)
+
+        assert result.suffix == ".png"
+        assert result.read_bytes() == sample_screenshot_bytes
+
+
+class TestAddHighlightBox:
+    """Tests for highlighting an element in a saved screenshot."""
+
+    def test_highlights_file_in_place(self, temp_dir: Path) -> None:
+        """Test that the border is drawn into the image file itself."""
+        path = temp_dir / "shot.png"
+        Image.new("RGB", (40, 40), "white").save(path)
+
+        add_highlight_box(path, {"x": 10, "y": 10, "width": 20, "height": 20})
+
+        with Image.open(path) as img:
+            assert img.getpixel((8, 20)) == (255, 0, 0)
+            assert img.getpixel((20, 20)) == (255, 255, 255)
+
+
+class TestDrawHighlight:
+    """Tests for drawing the element highlight."""
+
+    def test_border_surrounds_element(self) -> None:
+        """Test that the 3px border sits just outside the element box."""
+        img = Image.new("RGB", (40, 40), "white")
+
+        _draw_highlight(img, {"x": 10, "y": 10, "width": 20, "height": 20})
+
+        assert [img.getpixel((x, 20)) for x in range(7, 12)] == [
+            (255, 255, 255),
+            (255, 0, 0),
+            (255, 0, 0),
+            (255, 0, 0),
+            (255, 255, 255),
+        ]
+
+    def test_empty_box_draws_nothing(self) -> None:
+        """Test that a zero-sized element is not outlined."""
+        img = Image.new("RGB", (40, 40), "white")
+
+        _draw_highlight(img, {"x": 10, "y": 10, "width": 0, "height": 20})
+
+        assert img.getcolors() == [(1600, (255, 255, 255))]
 
 
 class TestScreenshotIntegration:
@@ -125,7 +223,7 @@ class TestScreenshotIntegration:
         screenshot_path = temp_dir / "test_screenshot.png"
         screenshot_path.write_bytes(sample_screenshot_bytes)
         
-        assert screenshot_path.exists()
+        # stat() raises FileNotFoundError for a missing file, so one call covers both checks.
         assert screenshot_path.stat().st_size > 0
 
     def test_screenshot_is_valid_png(
@@ -134,10 +232,8 @@ class TestScreenshotIntegration:
     ) -> None:
         """Test that created screenshot is valid PNG."""
         content = sample_screenshot_file.read_bytes()
-        
-        # PNG files start with specific bytes
-        png_signature = bytes([0x89, 0x50, 0x4E, 0x47, 0x0D, 0x0A, 0x1A, 0x0A])
-        assert content[:8] == png_signature
+
+        assert content[:8] == _PNG_SIGNATURE
 
     def test_multiple_screenshots(
         self,
@@ -149,9 +245,8 @@ class TestScreenshotIntegration:
             filename = generate_screenshot_filename(i + 1, "click", f"button{i}")
             path = temp_dir / filename
             path.write_bytes(sample_screenshot_bytes)
-            assert path.exists()
+            assert path.stat().st_size > 0
         
         # Check all files exist
-        png_files = list(temp_dir.glob("*.png"))
-        assert len(png_files) == 5
+        assert sum(1 for _ in temp_dir.glob("*.webp")) == 5
 